@@ -1,33 +1,224 @@
+import argparse
 import yaml
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.colors import LogNorm
 from pathlib import Path
 
-# Load data from emotional logs
-data_dir = Path('../data/emotional_logs')
-coherences = []
-sec_drifts = []
-
-for file in data_dir.glob('*.yaml'):
-    with open(file, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
-        if 'interventions' in data:
-            for intervention in data['interventions']:
-                pre_coherence = intervention['pre_state']['rhacc']['coherence']
+# Inputs up to this many interventions are drawn as a plain scatter plot;
+# larger inputs are rendered as a 2D density histogram
+SCATTER_THRESHOLD = 50000
+
+
+def iter_interventions(f):
+    """Yield the items of each document's 'interventions' list one at a time.
+
+    The safe loader's event API is walked by hand and only one intervention
+    node is composed at a time, so a log never has to be loaded whole.
+    Anchors stay available until the end of their document so aliases
+    resolve.
+    """
+    loader = yaml.SafeLoader(f)
+    try:
+        loader.get_event()
+        while not loader.check_event(yaml.StreamEndEvent):
+            loader.get_event()
+            if not loader.check_event(yaml.MappingStartEvent):
+                loader.compose_node(None, None)
+            else:
+                loader.get_event()
+                while not loader.check_event(yaml.MappingEndEvent):
+                    key = loader.construct_document(loader.compose_node(None, None))
+                    if key == 'interventions' and loader.check_event(yaml.SequenceStartEvent):
+                        loader.get_event()
+                        while not loader.check_event(yaml.SequenceEndEvent):
+                            yield loader.construct_document(loader.compose_node(None, None))
+                        loader.get_event()
+                    else:
+                        loader.compose_node(None, None)
+                loader.get_event()
+            loader.get_event()
+            loader.anchors = {}
+    finally:
+        loader.dispose()
+
+
+def iter_intervention_chunks(data_dir, chunk_size=100000):
+    """Yield (sec_drifts, coherences) array chunks from the emotional log YAML files."""
+    coherences = []
+    sec_drifts = []
+
+    for file in sorted(Path(data_dir).glob('*.yaml')):
+        with open(file, 'r', encoding='utf-8') as f:
+            for intervention in iter_interventions(f):
                 post_coherence = intervention['post_state']['rhacc']['coherence']
                 pre_arousal = intervention['pre_state']['sec_vector']['arousal']
                 post_arousal = intervention['post_state']['sec_vector']['arousal']
-                sec_drift = abs(post_arousal - pre_arousal)
+                sec_drifts.append(abs(post_arousal - pre_arousal))
                 coherences.append(post_coherence)
-                sec_drifts.append(sec_drift)
-
-# Figure 1: Coherence Collapse vs. SEC Drift
-plt.figure(figsize=(8, 6))
-plt.scatter(sec_drifts, coherences, alpha=0.7)
-plt.xlabel('SEC Drift (Arousal Change)')
-plt.ylabel('Symbolic Coherence Metric')
-plt.title('Coherence Collapse vs. SEC Drift Under Stress')
-plt.grid(True)
-plt.savefig('../figures/fig1_coherence_vs_sec_drift.png')
\ No newline at end of file
+
+                if len(sec_drifts) >= chunk_size:
+                    yield np.asarray(sec_drifts), np.asarray(coherences)
+                    coherences = []
+                    sec_drifts = []
+
+    if sec_drifts:
+        yield np.asarray(sec_drifts), np.asarray(coherences)
+
+
+def synthetic_intervention_chunks(n_points, chunk_size=100000, seed=0):
+    """Yield synthetic (sec_drifts, coherences) chunks for exercising the renderer at scale."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_points, chunk_size):
+        n = min(chunk_size, n_points - start)
+        sec_drifts = np.abs(rng.normal(0.0, 0.15, n))
+        coherences = np.clip(0.9 - 1.5 * sec_drifts + rng.normal(0.0, 0.08, n), 0.0, 1.0)
+        yield sec_drifts, coherences
+
+
+class DensityAccumulator:
+    """Accumulates a fixed-grid 2D histogram chunk by chunk.
+
+    Points are binned with vectorized index arithmetic and np.bincount, so
+    memory stays proportional to the grid rather than the number of points.
+    Points outside the range are clipped into the edge bins. The first
+    scatter_threshold points are also kept so small inputs can still be drawn
+    as a scatter plot.
+    """
+
+    def __init__(self, x_range=(0.0, 1.0), y_range=(0.0, 1.0), bins=(200, 200),
+                 scatter_threshold=SCATTER_THRESHOLD):
+        self.x_range = x_range
+        self.y_range = y_range
+        self.bins = bins
+        self.scatter_threshold = scatter_threshold
+        self.counts = np.zeros(bins[0] * bins[1], dtype=np.int64)
+        self.n_points = 0
+        self._kept_x = []
+        self._kept_y = []
+
+    def add(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        valid = np.isfinite(x) & np.isfinite(y)
+        x, y = x[valid], y[valid]
+
+        nx, ny = self.bins
+        ix = ((x - self.x_range[0]) * (nx / (self.x_range[1] - self.x_range[0]))).astype(np.int64)
+        iy = ((y - self.y_range[0]) * (ny / (self.y_range[1] - self.y_range[0]))).astype(np.int64)
+        np.clip(ix, 0, nx - 1, out=ix)
+        np.clip(iy, 0, ny - 1, out=iy)
+
+        self.counts += np.bincount(ix * ny + iy, minlength=nx * ny)
+        self.n_points += len(x)
+
+        # Raw points are only needed while the input is still small enough to scatter
+        if self.n_points <= self.scatter_threshold:
+            self._kept_x.append(x)
+            self._kept_y.append(y)
+        elif self._kept_x:
+            self._kept_x = []
+            self._kept_y = []
+
+    @property
+    def histogram(self):
+        """Counts as an (x_bins, y_bins) array."""
+        return self.counts.reshape(self.bins)
+
+    @property
+    def x_edges(self):
+        return np.linspace(self.x_range[0], self.x_range[1], self.bins[0] + 1)
+
+    @property
+    def y_edges(self):
+        return np.linspace(self.y_range[0], self.y_range[1], self.bins[1] + 1)
+
+    def use_scatter(self):
+        return self.n_points <= self.scatter_threshold
+
+    def kept_points(self):
+        if not self._kept_x:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(self._kept_x), np.concatenate(self._kept_y)
+
+
+def render_phase_space(accumulator, output_path, log_scale=True, marginals=False):
+    """Draw coherence vs. SEC drift as a scatter (small inputs) or density plot."""
+    fig = plt.figure(figsize=(8, 6))
+
+    if marginals:
+        grid = fig.add_gridspec(2, 2, width_ratios=(4, 1), height_ratios=(1, 4),
+                                wspace=0.05, hspace=0.05)
+        ax = fig.add_subplot(grid[1, 0])
+        ax_top = fig.add_subplot(grid[0, 0], sharex=ax)
+        ax_right = fig.add_subplot(grid[1, 1], sharey=ax)
+    else:
+        ax = fig.add_subplot(1, 1, 1)
+
+    if accumulator.use_scatter():
+        sec_drifts, coherences = accumulator.kept_points()
+        ax.scatter(sec_drifts, coherences, alpha=0.7)
+    else:
+        histogram = accumulator.histogram
+        norm = LogNorm(vmin=1, vmax=max(histogram.max(), 1)) if log_scale else None
+        # pcolormesh expects (rows=y, cols=x); masked zeros stay transparent under LogNorm
+        mesh = ax.pcolormesh(accumulator.x_edges, accumulator.y_edges,
+                             np.ma.masked_equal(histogram.T, 0), norm=norm,
+                             cmap='viridis', shading='flat', rasterized=True)
+        fig.colorbar(mesh, ax=ax_right if marginals else ax,
+                     label='Interventions per bin' + (' (log)' if log_scale else ''))
+
+    if marginals:
+        histogram = accumulator.histogram
+        ax_top.stairs(histogram.sum(axis=1), accumulator.x_edges, fill=True, alpha=0.6)
+        ax_right.stairs(histogram.sum(axis=0), accumulator.y_edges, fill=True, alpha=0.6,
+                        orientation='horizontal')
+        ax_top.tick_params(labelbottom=False)
+        ax_right.tick_params(labelleft=False)
+        if log_scale:
+            ax_top.set_yscale('log')
+            ax_right.set_xscale('log')
+        ax_top.set_title('Coherence Collapse vs. SEC Drift Under Stress')
+    else:
+        ax.set_title('Coherence Collapse vs. SEC Drift Under Stress')
+
+    ax.set_xlabel('SEC Drift (Arousal Change)')
+    ax.set_ylabel('Symbolic Coherence Metric')
+    ax.grid(True)
+    fig.savefig(output_path)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Figure 1: Coherence Collapse vs. SEC Drift')
+    parser.add_argument('--data-dir', default='../data/emotional_logs')
+    parser.add_argument('--output', default='../figures/fig1_coherence_vs_sec_drift.png')
+    parser.add_argument('--bins', type=int, default=200)
+    parser.add_argument('--linear', action='store_true', help='Linear instead of log color scale')
+    parser.add_argument('--marginals', action='store_true', help='Add marginal histograms')
+    parser.add_argument('--scatter-threshold', type=int, default=SCATTER_THRESHOLD)
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--synthetic', type=int, help='Render N synthetic interventions instead of the logs')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        chunks = synthetic_intervention_chunks(args.synthetic, args.chunk_size)
+    else:
+        chunks = iter_intervention_chunks(args.data_dir, args.chunk_size)
+
+    # Arousal is bounded to [0, 1], so drift and coherence share the unit square
+    accumulator = DensityAccumulator(bins=(args.bins, args.bins),
+                                     scatter_threshold=args.scatter_threshold)
+    for sec_drifts, coherences in chunks:
+        accumulator.add(sec_drifts, coherences)
+
+    # Figure 1: Coherence Collapse vs. SEC Drift
+    render_phase_space(accumulator, args.output, log_scale=not args.linear,
+                       marginals=args.marginals)
+
+
+if __name__ == '__main__':
+    main()
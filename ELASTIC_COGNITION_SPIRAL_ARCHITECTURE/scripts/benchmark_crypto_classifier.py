@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Crypto Tax Classifier Throughput Benchmark
+
+Replays synthetic crypto transaction streams through a pluggable classifier
+callable at configurable batch sizes and concurrency levels, recording
+per-transaction latency percentiles and transactions/second.
+
+The default classifier is a rule-based stub so the harness runs without the
+full SpiralBrain system. Point --entry-point at
+domains.crypto_platform.cryptoai_platform:CryptoAIPlatform (or any
+"module:attribute" callable accepting a list of transactions) to benchmark
+the real entry point.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+
+def generate_crypto_transaction_stream(n_transactions=1000, seed=None):
+    """Generate synthetic crypto transactions with ground-truth tax labels."""
+    rng = random.Random(seed)
+
+    # Transaction types and their tax treatment
+    transaction_profiles = {
+        "transfer": {
+            "label": "non_taxable_transfer",
+            "amount_range": (0.01, 5.0),
+            "weight": 0.35,
+        },
+        "sell": {
+            "label": "capital_gain_short_term",
+            "amount_range": (0.001, 2.0),
+            "weight": 0.30,
+        },
+        "staking_reward": {
+            "label": "ordinary_income",
+            "amount_range": (0.0001, 0.5),
+            "weight": 0.15,
+        },
+        "airdrop": {
+            "label": "ordinary_income",
+            "amount_range": (1.0, 1000.0),
+            "weight": 0.10,
+        },
+        "mining_reward": {
+            "label": "ordinary_income",
+            "amount_range": (0.0001, 0.1),
+            "weight": 0.10,
+        },
+    }
+
+    # Reference prices per asset
+    asset_prices = {
+        "BTC": (60000, 110000),
+        "ETH": (2000, 4500),
+        "SOL": (80, 250),
+        "ADA": (0.3, 1.2),
+    }
+
+    tx_types = list(transaction_profiles.keys())
+    weights = [transaction_profiles[t]["weight"] for t in tx_types]
+    start = datetime(2025, 1, 1)
+
+    transactions = []
+
+    for i in range(n_transactions):
+        tx_type = rng.choices(tx_types, weights=weights)[0]
+        profile = transaction_profiles[tx_type]
+        asset = rng.choice(list(asset_prices.keys()))
+
+        amount = rng.uniform(*profile["amount_range"])
+        price = rng.uniform(*asset_prices[asset])
+
+        transaction = {
+            "transaction_id": f"TX_{i + 1:06d}",
+            "type": tx_type,
+            "asset": asset,
+            "amount": round(amount, 8),
+            "price_usd": round(price, 2),
+            "value_usd": round(amount * price, 2),
+            "timestamp": (start + timedelta(minutes=rng.randint(0, 525600))).isoformat(),
+            "from_wallet": f"wallet_{rng.randint(1, 50):03d}",
+            "to_wallet": f"wallet_{rng.randint(1, 50):03d}",
+            "ground_truth": profile["label"],
+        }
+
+        transactions.append(transaction)
+
+    return transactions
+
+
+def stub_classifier(batch):
+    """Rule-based stand-in for CryptoAIPlatform used when the full system is unavailable."""
+    results = []
+
+    for tx in batch:
+        if tx["type"] == "transfer":
+            classification, confidence = "non_taxable_transfer", 0.9
+        elif tx["type"] == "sell":
+            classification, confidence = "capital_gain_short_term", 0.8
+        else:
+            classification, confidence = "ordinary_income", 0.7
+
+        results.append(
+            {
+                "transaction_id": tx["transaction_id"],
+                "classification": classification,
+                "confidence": confidence,
+            }
+        )
+
+    return results
+
+
+def load_classifier(entry_point):
+    """Resolve a "module:attribute" spec into a batch classifier callable.
+
+    Classes are instantiated with no arguments; the instance must itself be
+    callable or expose a ``classify_batch`` method.
+    """
+    module_name, _, attr = entry_point.partition(":")
+    if not attr:
+        module_name, _, attr = entry_point.rpartition(".")
+
+    target = getattr(importlib.import_module(module_name), attr)
+
+    if isinstance(target, type):
+        instance = target()
+        if hasattr(instance, "classify_batch"):
+            return instance.classify_batch
+        target = instance
+
+    if not callable(target):
+        raise TypeError(f"{entry_point} is not callable")
+
+    return target
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def run_benchmark(classifier, transactions, batch_size=1, concurrency=1):
+    """Replay transactions through the classifier and collect latency/throughput stats.
+
+    Every transaction in a batch is assigned the latency of the batch call it
+    travelled in, which is what a caller waiting on that transaction observes.
+    """
+    batches = [transactions[i : i + batch_size] for i in range(0, len(transactions), batch_size)]
+
+    def timed_call(batch):
+        start = time.perf_counter()
+        results = classifier(batch)
+        return time.perf_counter() - start, batch, results
+
+    wall_start = time.perf_counter()
+
+    if concurrency <= 1:
+        outcomes = [timed_call(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(timed_call, batches))
+
+    wall_time = time.perf_counter() - wall_start
+
+    latencies_ms = []
+    correct = 0
+    total = 0
+
+    for elapsed, batch, results in outcomes:
+        latencies_ms.extend([elapsed * 1000.0] * len(batch))
+        for tx, result in zip(batch, results, strict=False):
+            total += 1
+            if result.get("classification") == tx["ground_truth"]:
+                correct += 1
+
+    latencies_ms.sort()
+
+    return {
+        "batch_size": batch_size,
+        "concurrency": concurrency,
+        "n_transactions": len(transactions),
+        "n_batches": len(batches),
+        "wall_time_seconds": wall_time,
+        "transactions_per_second": len(transactions) / wall_time if wall_time > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies_ms, 50),
+            "p90": percentile(latencies_ms, 90),
+            "p95": percentile(latencies_ms, 95),
+            "p99": percentile(latencies_ms, 99),
+            "max": latencies_ms[-1] if latencies_ms else 0.0,
+            "mean": sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0.0,
+        },
+        "accuracy": correct / total if total else 0.0,
+    }
+
+
+def run_benchmark_matrix(
+    classifier,
+    n_transactions=1000,
+    batch_sizes=(1, 8, 32, 128),
+    concurrency_levels=(1, 4),
+    seed=42,
+    warmup=50,
+):
+    """Benchmark every (batch_size, concurrency) combination on the same stream."""
+    transactions = generate_crypto_transaction_stream(n_transactions, seed=seed)
+
+    # Warm up caches/lazy initialisation so the first configuration is not penalised
+    if warmup:
+        classifier(transactions[:warmup])
+
+    results = []
+
+    for batch_size in batch_sizes:
+        for concurrency in concurrency_levels:
+            stats = run_benchmark(classifier, transactions, batch_size, concurrency)
+            results.append(stats)
+            print(
+                f"  batch={batch_size:<4} workers={concurrency:<3} "
+                f"{stats['transactions_per_second']:>10.1f} tx/s  "
+                f"p50={stats['latency_ms']['p50']:.3f}ms  "
+                f"p99={stats['latency_ms']['p99']:.3f}ms  "
+                f"acc={stats['accuracy']:.3f}"
+            )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--entry-point",
+        help="Classifier as module:attribute (default: built-in stub classifier)",
+    )
+    parser.add_argument("--n-transactions", type=int, default=1000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--output", help="Write results JSON to this path")
+    args = parser.parse_args()
+
+    if args.entry_point:
+        classifier = load_classifier(args.entry_point)
+        entry_point = args.entry_point
+    else:
+        classifier = stub_classifier
+        entry_point = "stub_classifier"
+
+    print("🚀 Crypto tax classifier throughput benchmark")
+    print(f"   Entry point: {entry_point}")
+    print(f"   Transactions: {args.n_transactions}")
+
+    results = run_benchmark_matrix(
+        classifier,
+        n_transactions=args.n_transactions,
+        batch_sizes=args.batch_sizes,
+        concurrency_levels=args.concurrency,
+        seed=args.seed,
+        warmup=args.warmup,
+    )
+
+    if args.output:
+        report = {
+            "benchmark_name": "crypto_tax_classifier_throughput",
+            "timestamp": datetime.now().isoformat(),
+            "entry_point": entry_point,
+            "n_transactions": args.n_transactions,
+            "seed": args.seed,
+            "results": results,
+        }
+
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"✅ Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+SpiralBrain Script Performance Benchmark Suite
+
+Times and measures peak memory for the dataset generators, each publication
+figure, the publication package archiver and loading trace/homeostasis files
+at scale. Results are written to a JSON baseline and compared run over run;
+any benchmark slower (or hungrier) than the baseline by more than the
+regression threshold is reported and fails the run.
+
+Usage:
+    python benchmark_suite.py                        # run and compare against baseline
+    python benchmark_suite.py --update-baseline      # record a new baseline
+    python benchmark_suite.py --filter figure --repeat 5 --threshold 0.1
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = SCRIPTS_DIR / "benchmarks" / "baseline.json"
+
+DATASET_SIZES = [100, 1000, 10000]
+TRACE_SIZES = [1000, 10000, 100000]
+
+
+def _synthetic_trace_record(i, rng):
+    """Record shaped like a brain_trace.jsonl line."""
+    pathways = [
+        "Reasoning",
+        "Attention",
+        "InductiveMemory",
+        "DeductiveMemory",
+        "Creative",
+        "Analytical",
+        "Social",
+        "Temporal",
+    ]
+    coherence = rng.uniform(0.6, 0.8)
+
+    return {
+        "t_rel": i * 0.05,
+        "coherence": coherence,
+        "stability": rng.uniform(0.7, 0.9),
+        "hazard_pressure": rng.uniform(0.05, 0.15),
+        "sec_drift": rng.uniform(-0.1, 0.1),
+        "meta_awareness": coherence,
+        "active_pathways": {
+            "active_pathways": pathways,
+            "pathway_weights": {name: rng.uniform(0.9, 1.1) for name in pathways},
+            "total_pathways": len(pathways),
+            "pathway_status": "unified_cognitive_substrate",
+            "pathways_timestamp": datetime(2025, 12, 20).isoformat(),
+            "platform_pathways": ["finance", "crypto", "tax", "compliance"],
+            "active_domains": ["blockchain", "financial"],
+        },
+    }
+
+
+def _synthetic_homeostasis_cycle(i, rng):
+    """Cycle entry shaped like homeostasis_cycle.json."""
+    return {
+        "timestamp": 1765332724.0 + i * 0.16,
+        "cycle": i + 1,
+        "ccs_current": rng.uniform(0.5, 0.9),
+        "ccs_baseline": 0.8,
+        "delta_ccs": rng.uniform(-0.1, 0.1),
+        "sec_drift": rng.uniform(0.0, 0.2),
+        "phase_lock": rng.uniform(0.0, 90.0),
+        "phase_lock_derivative": rng.uniform(-20.0, 20.0),
+        "epci": rng.uniform(0.8, 1.0),
+        "sec_entropy": rng.uniform(2.0, 3.0),
+        "recovery_time": rng.randint(5, 15),
+        "regulation_applied": rng.random() < 0.3,
+        "regulation_strategy": "none",
+        "exploration_encouraged": False,
+        "emoji_sync_status": "🟡",
+        "anomalies": [],
+    }
+
+
+def _write_trace_fixture(path, n_records):
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n_records):
+            f.write(json.dumps(_synthetic_trace_record(i, rng)) + "\n")
+
+
+def _write_homeostasis_fixture(path, n_cycles):
+    rng = random.Random(0)
+    data = {
+        "session_start": datetime(2025, 12, 9).isoformat(),
+        "ccs_baseline": 0.8,
+        "drift_threshold_high": 0.1,
+        "drift_threshold_low": 0.02,
+        "cycles": [_synthetic_homeostasis_cycle(i, rng) for i in range(n_cycles)],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def _load_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _build_package_tree(root, n_files=200, file_size=64 * 1024):
+    """Populate a synthetic publication_package tree for the archiver."""
+    rng = random.Random(0)
+    package_dir = root / "publication_package"
+
+    for i in range(n_files):
+        subdir = package_dir / ["paper", "datasets", "code", "replication", "figures"][i % 5]
+        subdir.mkdir(parents=True, exist_ok=True)
+        # Half-compressible payload, similar to logs mixed with images
+        payload = rng.randbytes(file_size // 2) + b"spiral " * (file_size // 14)
+        (subdir / f"file_{i:04d}.bin").write_bytes(payload)
+
+
+def collect_benchmarks(workdir):
+    """Return a list of (name, setup, func) benchmark definitions.
+
+    setup runs once outside the measured region; func is the measured call.
+    """
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+    import generate_strength_datasets as datasets
+
+    benchmarks = []
+
+    for n in DATASET_SIZES:
+
+        def finance(n=n):
+            random.seed(0)
+            datasets.generate_multimodal_finance_dataset(
+                n_samples=n, output_file=str(workdir / "data" / "multimodal_finance.csv")
+            )
+
+        def emotional(n=n):
+            random.seed(0)
+            datasets.generate_emotional_reasoning_dataset(
+                n_samples=n, output_file=str(workdir / "data" / "emotional_reasoning.json")
+            )
+
+        benchmarks.append((f"dataset.multimodal_finance[n={n}]", None, finance))
+        benchmarks.append((f"dataset.emotional_reasoning[n={n}]", None, emotional))
+
+    import generate_publication_figures as figures
+
+    figures_dir = workdir / "publication_package" / "figures"
+    figures_dir.mkdir(parents=True, exist_ok=True)
+
+    for create_figure, _ in figures.FIGURES.values():
+        benchmarks.append(
+            (f"figure.{create_figure.__name__}", None, lambda f=create_figure: f(figures_dir))
+        )
+
+    from create_publication_package import PublicationPackager
+
+    package_root = workdir / "package_root"
+
+    def package_setup():
+        if not (package_root / "publication_package").exists():
+            _build_package_tree(package_root)
+
+    def package_zip():
+        PublicationPackager(str(package_root)).create_zip_archive()
+
+    benchmarks.append(("package.create_zip_archive", package_setup, package_zip))
+
+    for n in TRACE_SIZES:
+        trace_path = workdir / f"brain_trace_{n}.jsonl"
+        cycle_path = workdir / f"homeostasis_cycle_{n}.json"
+
+        benchmarks.append(
+            (
+                f"load.brain_trace[n={n}]",
+                lambda p=trace_path, n=n: p.exists() or _write_trace_fixture(p, n),
+                lambda p=trace_path: _load_jsonl(p),
+            )
+        )
+        benchmarks.append(
+            (
+                f"load.homeostasis_cycle[n={n}]",
+                lambda p=cycle_path, n=n: p.exists() or _write_homeostasis_fixture(p, n),
+                lambda p=cycle_path: _load_json(p),
+            )
+        )
+
+    return benchmarks
+
+
+def measure(func, repeat=3):
+    """Time func repeat times, then run it once more under tracemalloc for peak memory.
+
+    An untimed warm-up call runs first, so a lazily imported backend is not
+    charged to the first benchmark that happens to load it.
+    """
+    func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # Separate pass: tracemalloc slows allocation-heavy code considerably
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "repeat": repeat,
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def run_suite(repeat=3, name_filter=None):
+    """Run every benchmark in an isolated temporary directory."""
+    results = {}
+    original_cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory(prefix="spiralbrain_bench_") as tmp:
+        workdir = Path(tmp)
+        os.chdir(workdir)
+
+        try:
+            # Silence the scripts' progress output while measuring
+            with contextlib.redirect_stdout(io.StringIO()):
+                benchmarks = collect_benchmarks(workdir)
+
+            for name, setup, func in benchmarks:
+                if name_filter and name_filter not in name:
+                    continue
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if setup:
+                        setup()
+                    results[name] = measure(func, repeat=repeat)
+
+                stats = results[name]
+                print(f"  {name:<45} {stats['median_s'] * 1000:>10.1f} ms  {stats['peak_mb']:>8.2f} MB")
+        finally:
+            os.chdir(original_cwd)
+
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=0.2):
+    """Return a list of regression descriptions for metrics beyond the threshold."""
+    regressions = []
+
+    for name, stats in results.items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+
+        for metric in ("median_s", "peak_mb"):
+            before, after = previous.get(metric), stats.get(metric)
+            if not before or after is None:
+                continue
+
+            change = (after - before) / before
+            if change > threshold:
+                regressions.append(
+                    {
+                        "benchmark": name,
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                        "change": change,
+                    }
+                )
+
+    return regressions
+
+
+def environment_info():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file")
+    args = parser.parse_args()
+
+    print("⏱️  SpiralBrain benchmark suite")
+    results = run_suite(repeat=args.repeat, name_filter=args.filter)
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "environment": environment_info(),
+        "benchmarks": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+
+    if args.update_baseline or not baseline_path.exists():
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        if baseline_path.exists():
+            # Keep entries for benchmarks skipped by --filter
+            with open(baseline_path, encoding="utf-8") as f:
+                previous = json.load(f)
+            report["benchmarks"] = {**previous.get("benchmarks", {}), **results}
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline saved to: {baseline_path}")
+        return 0
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(results, baseline, threshold=args.threshold)
+
+    if not regressions:
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {baseline_path}")
+        return 0
+
+    print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+    for r in regressions:
+        print(
+            f"   {r['benchmark']} {r['metric']}: {r['baseline']:.4g} → {r['current']:.4g} "
+            f"(+{r['change']:.0%})"
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
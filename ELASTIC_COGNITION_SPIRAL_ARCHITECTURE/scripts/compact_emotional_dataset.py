@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Template-Compressed Emotional Reasoning Dataset
+
+Every `text` in the emotional reasoning dataset is one of a few templates
+filled with an emotion word and a context phrase, plus an optional
+contradiction suffix. Instead of storing the materialized string per row, this
+representation keeps (template id, emotion word id, context phrase id,
+suffix id) as small integer arrays alongside the numeric columns, and
+materializes strings on demand (single rows or batch-decoded slices).
+
+context, primary_emotion, emotion_label and is_mixed_emotion are recovered
+from the ids, so the stored columns are just the ids, the two intensities and
+the SEC vector. to_records() returns rows identical to those written by
+generate_emotional_reasoning_dataset().
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from generate_strength_datasets import (
+    CONTEXT_WORDS,
+    CONTRADICTIONS,
+    EMOTIONS,
+    TEXT_TEMPLATES,
+    sample_emotional_reasoning_rows,
+)
+
+BASE_SEC_KEYS = ["arousal", "valence", "dominance", "anger", "fear", "joy", "sadness", "surprise"]
+
+
+class EmotionalTextVocabulary:
+    """Flat lookup tables mapping integer ids to template pieces."""
+
+    def __init__(self, emotions, text_templates, context_words, contradictions):
+        self.emotions = emotions
+        self.text_templates = text_templates
+        self.context_words = context_words
+        self.contradictions = contradictions
+
+        self.emotion_names = list(emotions)
+        self.context_names = list(text_templates)
+
+        # Flattened tables; ids are offsets into these
+        self.templates = [t for c in self.context_names for t in text_templates[c]]
+        self.template_context = [i for i, c in enumerate(self.context_names) for _ in text_templates[c]]
+        self.words = [w for e in self.emotion_names for w in emotions[e]]
+        self.word_emotion = [i for i, e in enumerate(self.emotion_names) for _ in emotions[e]]
+        self.phrases = [p for c in self.context_names for p in context_words[c]]
+        self.suffixes = [""] + list(contradictions)
+
+        self._template_offset = self._offsets(text_templates, self.context_names)
+        self._word_offset = self._offsets(emotions, self.emotion_names)
+        self._phrase_offset = self._offsets(context_words, self.context_names)
+
+        # SEC vector columns; emotions outside the base keys appear only when
+        # they are the secondary emotion of a mixed row
+        self.sec_keys = BASE_SEC_KEYS + [e for e in self.emotion_names if e not in BASE_SEC_KEYS]
+
+        if max(len(self.templates), len(self.words), len(self.phrases), len(self.suffixes)) > 255:
+            raise ValueError("Vocabulary too large for uint8 ids")
+
+    @staticmethod
+    def _offsets(table, names):
+        offsets, total = {}, 0
+        for name in names:
+            offsets[name] = total
+            total += len(table[name])
+        return offsets
+
+    @classmethod
+    def default(cls):
+        """Vocabulary used by generate_strength_datasets."""
+        return cls(EMOTIONS, TEXT_TEMPLATES, CONTEXT_WORDS, CONTRADICTIONS)
+
+    def to_json(self):
+        return json.dumps(
+            {
+                "emotions": self.emotions,
+                "text_templates": self.text_templates,
+                "context_words": self.context_words,
+                "contradictions": self.contradictions,
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        return cls(data["emotions"], data["text_templates"], data["context_words"], data["contradictions"])
+
+    def encode_parts(self, context, primary_emotion, text_parts):
+        """Convert per-context/per-emotion indices into global (template, word, phrase, suffix) ids."""
+        template_index, word_index, phrase_index, suffix_index = text_parts
+        return (
+            self._template_offset[context] + template_index,
+            self._word_offset[primary_emotion] + word_index,
+            self._phrase_offset[context] + phrase_index,
+            0 if suffix_index is None else suffix_index + 1,
+        )
+
+    def decode(self, template_id, word_id, phrase_id, suffix_id):
+        """Materialize one text from global ids."""
+        text = self.templates[template_id].format(self.words[word_id], self.phrases[phrase_id])
+        return text + self.suffixes[suffix_id]
+
+
+class TextColumn:
+    """Lazy, list-like view that materializes texts from id arrays."""
+
+    def __init__(self, dataset):
+        self._dataset = dataset
+
+    def __len__(self):
+        return len(self._dataset)
+
+    def __getitem__(self, index):
+        if isinstance(index, int | np.integer):
+            ds = self._dataset
+            return ds.vocab.decode(
+                int(ds.template_id[index]),
+                int(ds.word_id[index]),
+                int(ds.phrase_id[index]),
+                int(ds.suffix_id[index]),
+            )
+        return self._dataset.decode_texts(index)
+
+    def __iter__(self, chunk_size=10000):
+        for start in range(0, len(self), chunk_size):
+            yield from self._dataset.decode_texts(slice(start, start + chunk_size))
+
+    def tolist(self):
+        return self._dataset.decode_texts()
+
+
+class CompactEmotionalDataset:
+    """Columnar emotional reasoning dataset with template-compressed text."""
+
+    def __init__(
+        self,
+        template_id,
+        word_id,
+        phrase_id,
+        suffix_id,
+        secondary_id,
+        intensity_primary,
+        intensity_secondary,
+        sec_vector,
+        vocab=None,
+    ):
+        self.vocab = vocab or EmotionalTextVocabulary.default()
+        self.template_id = np.asarray(template_id, dtype=np.uint8)
+        self.word_id = np.asarray(word_id, dtype=np.uint8)
+        self.phrase_id = np.asarray(phrase_id, dtype=np.uint8)
+        self.suffix_id = np.asarray(suffix_id, dtype=np.uint8)
+        self.secondary_id = np.asarray(secondary_id, dtype=np.int8)
+        self.intensity_primary = np.asarray(intensity_primary, dtype=np.float64)
+        self.intensity_secondary = np.asarray(intensity_secondary, dtype=np.float64)
+        # NaN marks SEC keys absent from a row
+        self.sec_vector = np.asarray(sec_vector, dtype=np.float64)
+
+        self.texts = TextColumn(self)
+
+    def __len__(self):
+        return len(self.template_id)
+
+    @property
+    def nbytes(self):
+        """Memory used by the column arrays."""
+        return sum(
+            column.nbytes
+            for column in (
+                self.template_id,
+                self.word_id,
+                self.phrase_id,
+                self.suffix_id,
+                self.secondary_id,
+                self.intensity_primary,
+                self.intensity_secondary,
+                self.sec_vector,
+            )
+        )
+
+    @property
+    def context_id(self):
+        return np.asarray(self.vocab.template_context, dtype=np.uint8)[self.template_id]
+
+    @property
+    def primary_id(self):
+        return np.asarray(self.vocab.word_emotion, dtype=np.uint8)[self.word_id]
+
+    def decode_texts(self, index=slice(None)):
+        """Batch-decode texts for a slice, index array or boolean mask.
+
+        Each distinct (template, word, phrase, suffix) combination is
+        formatted once and shared by every row that uses it.
+        """
+        vocab = self.vocab
+        n_words, n_phrases, n_suffixes = len(vocab.words), len(vocab.phrases), len(vocab.suffixes)
+
+        codes = (
+            (self.template_id[index].astype(np.int64) * n_words + self.word_id[index]) * n_phrases
+            + self.phrase_id[index]
+        ) * n_suffixes + self.suffix_id[index]
+
+        unique_codes, inverse = np.unique(codes, return_inverse=True)
+
+        decoded = []
+        for code in unique_codes.tolist():
+            code, suffix_id = divmod(code, n_suffixes)
+            code, phrase_id = divmod(code, n_phrases)
+            template_id, word_id = divmod(code, n_words)
+            decoded.append(vocab.decode(template_id, word_id, phrase_id, suffix_id))
+
+        return np.asarray(decoded, dtype=object)[inverse.ravel()].tolist()
+
+    def to_records(self):
+        """Materialize rows identical to generate_emotional_reasoning_dataset() output."""
+        vocab = self.vocab
+        texts = self.decode_texts()
+        contexts = self.context_id.tolist()
+        primaries = self.primary_id.tolist()
+        sec_keys = vocab.sec_keys
+
+        records = []
+        for i, text in enumerate(texts):
+            primary = vocab.emotion_names[primaries[i]]
+            secondary_id = int(self.secondary_id[i])
+            secondary = vocab.emotion_names[secondary_id] if secondary_id >= 0 else None
+
+            sec_vector = {
+                key: value
+                for key, value in zip(sec_keys, self.sec_vector[i].tolist(), strict=False)
+                if value == value  # skip NaN (absent key)
+            }
+
+            records.append(
+                {
+                    "text": text,
+                    "primary_emotion": primary,
+                    "secondary_emotion": secondary,
+                    "emotion_label": f"{primary}_{secondary}" if secondary else primary,
+                    "context": vocab.context_names[contexts[i]],
+                    "sec_vector": sec_vector,
+                    "intensity_primary": float(self.intensity_primary[i]),
+                    "intensity_secondary": float(self.intensity_secondary[i]),
+                    "is_mixed_emotion": secondary is not None,
+                }
+            )
+
+        return records
+
+    @classmethod
+    def _from_rows(cls, rows, vocab, parts_for_row):
+        n = len(rows)
+        ids = np.zeros((n, 4), dtype=np.uint8)
+        secondary_id = np.full(n, -1, dtype=np.int8)
+        intensity_primary = np.zeros(n)
+        intensity_secondary = np.zeros(n)
+        sec_vector = np.full((n, len(vocab.sec_keys)), np.nan)
+        sec_index = {key: i for i, key in enumerate(vocab.sec_keys)}
+        emotion_index = {name: i for i, name in enumerate(vocab.emotion_names)}
+
+        for i, row in enumerate(rows):
+            ids[i] = vocab.encode_parts(row["context"], row["primary_emotion"], parts_for_row(row))
+            if row["secondary_emotion"]:
+                secondary_id[i] = emotion_index[row["secondary_emotion"]]
+            intensity_primary[i] = row["intensity_primary"]
+            intensity_secondary[i] = row["intensity_secondary"]
+            for key, value in row["sec_vector"].items():
+                sec_vector[i, sec_index[key]] = value
+
+        return cls(
+            ids[:, 0],
+            ids[:, 1],
+            ids[:, 2],
+            ids[:, 3],
+            secondary_id,
+            intensity_primary,
+            intensity_secondary,
+            sec_vector,
+            vocab=vocab,
+        )
+
+    @classmethod
+    def from_samples(cls, samples, vocab=None):
+        """Build from sample_emotional_reasoning_rows() output."""
+        vocab = vocab or EmotionalTextVocabulary.default()
+        return cls._from_rows(list(samples), vocab, lambda row: row["text_parts"])
+
+    @classmethod
+    def from_records(cls, records, vocab=None):
+        """Compress an already materialized dataset (e.g. a loaded emotional_reasoning.json).
+
+        Raises:
+            ValueError: If a text cannot be produced by the vocabulary.
+        """
+        vocab = vocab or EmotionalTextVocabulary.default()
+        lookups = {}
+
+        def parts_for_row(row):
+            key = (row["context"], row["primary_emotion"])
+            if key not in lookups:
+                # Every text reachable for this (context, emotion) pair
+                lookups[key] = {
+                    vocab.decode(*vocab.encode_parts(*key, parts)): parts
+                    for parts in _all_text_parts(vocab, *key)
+                }
+            try:
+                return lookups[key][row["text"]]
+            except KeyError:
+                raise ValueError(f"Text not expressible by vocabulary: {row['text']!r}") from None
+
+        return cls._from_rows(records, vocab, parts_for_row)
+
+    def save(self, path):
+        """Write the dataset as a compressed .npz archive with its vocabulary."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            template_id=self.template_id,
+            word_id=self.word_id,
+            phrase_id=self.phrase_id,
+            suffix_id=self.suffix_id,
+            secondary_id=self.secondary_id,
+            intensity_primary=self.intensity_primary,
+            intensity_secondary=self.intensity_secondary,
+            sec_vector=self.sec_vector,
+            vocab=np.array(self.vocab.to_json()),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            vocab = EmotionalTextVocabulary.from_json(str(data["vocab"]))
+            return cls(
+                data["template_id"],
+                data["word_id"],
+                data["phrase_id"],
+                data["suffix_id"],
+                data["secondary_id"],
+                data["intensity_primary"],
+                data["intensity_secondary"],
+                data["sec_vector"],
+                vocab=vocab,
+            )
+
+
+def _all_text_parts(vocab, context, primary_emotion):
+    for template_index in range(len(vocab.text_templates[context])):
+        for word_index in range(len(vocab.emotions[primary_emotion])):
+            for phrase_index in range(len(vocab.context_words[context])):
+                for suffix_index in [None, *range(len(vocab.contradictions))]:
+                    yield (template_index, word_index, phrase_index, suffix_index)
+
+
+def generate_compact_emotional_reasoning_dataset(
+    n_samples=500, output_file="data/emotional_reasoning.npz"
+):
+    """Generate the emotional reasoning dataset directly in compact form."""
+    dataset = CompactEmotionalDataset.from_samples(sample_emotional_reasoning_rows(n_samples))
+    dataset.save(output_file)
+
+    print(f"✅ Generated compact emotional reasoning dataset with {n_samples} samples")
+    print(f"   Saved to: {output_file} ({os.path.getsize(output_file):,} bytes)")
+    print(f"   In-memory columns: {dataset.nbytes:,} bytes")
+
+    return dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="Generate a compact dataset")
+    generate_parser.add_argument("--n-samples", type=int, default=500)
+    generate_parser.add_argument("--output", default="data/emotional_reasoning.npz")
+
+    compress_parser = subparsers.add_parser("compress", help="Convert emotional_reasoning.json to .npz")
+    compress_parser.add_argument("input")
+    compress_parser.add_argument("output")
+
+    expand_parser = subparsers.add_parser("expand", help="Convert .npz back to the original JSON")
+    expand_parser.add_argument("input")
+    expand_parser.add_argument("output")
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate_compact_emotional_reasoning_dataset(args.n_samples, args.output)
+
+    elif args.command == "compress":
+        with open(args.input, encoding="utf-8") as f:
+            records = json.load(f)
+        CompactEmotionalDataset.from_records(records).save(args.output)
+        original, compact = os.path.getsize(args.input), os.path.getsize(args.output)
+        print(f"✅ Compressed {len(records)} rows: {original:,} → {compact:,} bytes ({original / compact:.1f}x)")
+
+    else:
+        records = CompactEmotionalDataset.load(args.input).to_records()
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        print(f"✅ Expanded {len(records)} rows to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
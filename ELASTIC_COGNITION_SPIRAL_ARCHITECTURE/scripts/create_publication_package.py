@@ -4,11 +4,14 @@ SpiralBrain Publication Package Generator
 Creates arXiv-ready manuscript package with paper, datasets, and replication materials
 """
 
+import argparse
 import shutil
 import zipfile
 from datetime import datetime
 from pathlib import Path
 
+from profiling import StageProfiler, add_profiling_arguments
+
 
 class PublicationPackager:
     """Creates publication-ready package for arXiv submission"""
@@ -326,18 +329,26 @@ https://github.com/jhcragin/SpiralBrain-v2.0
         print(f"✅ Publication package created: {zip_path}")
         print(f"   Size: {zip_path.stat().st_size / (1024*1024):.1f} MB")
 
-    def generate_package(self):
+    def generate_package(self, profiler: StageProfiler = None):
         """Generate complete publication package"""
         print("🚀 Generating SpiralBrain Publication Package")
         print("=" * 50)
 
-        self.create_package_structure()
-        self.copy_paper_files()
-        self.copy_datasets()
-        self.copy_code()
-        self.copy_replication_materials()
-        self.create_readme()
-        self.create_zip_archive()
+        profiler = profiler or StageProfiler()
+
+        steps = [
+            self.create_package_structure,
+            self.copy_paper_files,
+            self.copy_datasets,
+            self.copy_code,
+            self.copy_replication_materials,
+            self.create_readme,
+            self.create_zip_archive,
+        ]
+
+        for step in steps:
+            with profiler.stage(step.__name__):
+                step()
 
         print("\n" + "=" * 50)
         print("✅ Publication package generation complete!")
@@ -350,6 +361,13 @@ https://github.com/jhcragin/SpiralBrain-v2.0
         print("3. Submit to arXiv or journal")
         print("4. Share with research community")
 
+        profiler.finish()
+
 if __name__ == "__main__":
-    packager = PublicationPackager()
-    packager.generate_package()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create the SpiralBrain publication package")
+    parser.add_argument("--project-root", default=".")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    packager = PublicationPackager(args.project_root)
+    packager.generate_package(profiler=StageProfiler.from_args(args, prefix="package"))
\ No newline at end of file
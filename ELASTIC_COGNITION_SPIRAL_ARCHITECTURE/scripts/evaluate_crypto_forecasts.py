@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Rolling-Window Crypto Forecast Evaluator
+
+Computes the metrics reported in crypto_forecasting_results.json (mae, rmse,
+mape, direction_accuracy, sharpe_ratio, max_drawdown, returns_correlation)
+over sliding windows for every (crypto, horizon, model) series at once, and
+regenerates the model rank table in the crypto_forecasting_comparisons.json
+layout.
+
+All series are stacked into a single (n_series, n_days) array and windowed
+with strided NumPy views, so a walk-forward evaluation is a handful of array
+reductions rather than a Python loop per window.
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+METRICS = [
+    "mae",
+    "rmse",
+    "mape",
+    "direction_accuracy",
+    "sharpe_ratio",
+    "max_drawdown",
+    "returns_correlation",
+]
+
+# Metrics where a larger value is the better score; max_drawdown is stored
+# as a negative percentage, so the shallowest drawdown is the largest value
+HIGHER_IS_BETTER = {"direction_accuracy", "sharpe_ratio", "returns_correlation", "max_drawdown"}
+
+
+def _ranking_scores(values, metric):
+    """Scores for ascending sorts: negated for higher-is-better metrics, NaN last."""
+    scores = -values if metric in HIGHER_IS_BETTER else np.array(values, dtype=np.float64)
+    return np.where(np.isnan(scores), np.inf, scores)
+
+
+def _window_metrics(actual, predicted, window, periods_per_year):
+    """Metrics for every window of a (n_series, n_days) block."""
+    actual_w = sliding_window_view(actual, window, axis=-1)
+    predicted_w = sliding_window_view(predicted, window, axis=-1)
+
+    # Windows touching a missing observation are reported as NaN
+    incomplete = np.isnan(actual_w).any(axis=-1) | np.isnan(predicted_w).any(axis=-1)
+
+    error = predicted_w - actual_w
+    abs_error = np.abs(error)
+
+    mae = abs_error.mean(axis=-1)
+    rmse = np.sqrt(np.square(error).mean(axis=-1))
+    mape = (abs_error / np.abs(actual_w)).mean(axis=-1) * 100.0
+
+    # Day-over-day returns; the window over prices [k, k + window) spans
+    # returns [k, k + window - 1), so both views yield the same window count
+    previous = actual[:, :-1]
+    actual_returns = actual[:, 1:] / previous - 1.0
+    predicted_returns = predicted[:, 1:] / previous - 1.0
+
+    actual_rw = sliding_window_view(actual_returns, window - 1, axis=-1)
+    predicted_rw = sliding_window_view(predicted_returns, window - 1, axis=-1)
+    predicted_sign = np.sign(predicted_rw)
+
+    direction_accuracy = (predicted_sign == np.sign(actual_rw)).mean(axis=-1) * 100.0
+
+    # Long/short on the predicted direction
+    strategy_returns = predicted_sign * actual_rw
+    strategy_mean = strategy_returns.mean(axis=-1)
+    strategy_std = strategy_returns.std(axis=-1, ddof=1)
+    sharpe_ratio = np.divide(
+        strategy_mean,
+        strategy_std,
+        out=np.zeros_like(strategy_mean),
+        where=strategy_std > 0,
+    ) * np.sqrt(periods_per_year)
+
+    equity = np.cumprod(1.0 + strategy_returns, axis=-1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=-1), 1.0)
+    max_drawdown = (equity / peak - 1.0).min(axis=-1) * 100.0
+
+    actual_centered = actual_rw - actual_rw.mean(axis=-1, keepdims=True)
+    predicted_centered = predicted_rw - predicted_rw.mean(axis=-1, keepdims=True)
+    covariance = (actual_centered * predicted_centered).sum(axis=-1)
+    scale = np.sqrt(
+        np.square(actual_centered).sum(axis=-1) * np.square(predicted_centered).sum(axis=-1)
+    )
+    returns_correlation = np.divide(
+        covariance, scale, out=np.zeros_like(covariance), where=scale > 0
+    )
+
+    results = {
+        "mae": mae,
+        "rmse": rmse,
+        "mape": mape,
+        "direction_accuracy": direction_accuracy,
+        "sharpe_ratio": sharpe_ratio,
+        "max_drawdown": max_drawdown,
+        "returns_correlation": returns_correlation,
+    }
+
+    for values in results.values():
+        values[incomplete] = np.nan
+
+    return results
+
+
+def rolling_forecast_metrics(actual, predicted, window=30, periods_per_year=365, chunk_size=64):
+    """Compute every forecast metric over sliding windows.
+
+    Args:
+        actual: Array of shape (n_series, n_days) (or (n_days,)) of realised prices.
+        predicted: Array of the same shape with the model's price forecasts.
+        window: Window length in days (minimum 3).
+        periods_per_year: Annualisation factor for the Sharpe ratio.
+        chunk_size: Number of series evaluated per block, bounding the size of
+            the intermediate (chunk_size, n_windows, window) arrays.
+
+    Returns:
+        Dict mapping metric name to an (n_series, n_windows) array. Window k
+        covers days [k, k + window).
+    """
+    actual = np.atleast_2d(np.asarray(actual, dtype=np.float64))
+    predicted = np.atleast_2d(np.asarray(predicted, dtype=np.float64))
+
+    if actual.shape != predicted.shape:
+        raise ValueError(f"Shape mismatch: actual {actual.shape} vs predicted {predicted.shape}")
+    if window < 3:
+        raise ValueError("window must be at least 3 days")
+    if actual.shape[1] < window:
+        raise ValueError(f"Series length {actual.shape[1]} is shorter than window {window}")
+
+    n_series, n_days = actual.shape
+    n_windows = n_days - window + 1
+    results = {name: np.empty((n_series, n_windows)) for name in METRICS}
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, n_series, chunk_size):
+            stop = min(start + chunk_size, n_series)
+            block = _window_metrics(
+                actual[start:stop], predicted[start:stop], window, periods_per_year
+            )
+            for name in METRICS:
+                results[name][start:stop] = block[name]
+
+    return results
+
+
+def rank_models(metrics, keys, rank_metric="mae"):
+    """Rank models within each (crypto, horizon) group for every window.
+
+    Args:
+        metrics: Output of rolling_forecast_metrics.
+        keys: List of (crypto, horizon_days, model) tuples, one per series row.
+        rank_metric: Metric to rank on; direction follows HIGHER_IS_BETTER.
+
+    Returns:
+        Tuple of (groups, models, ranks) where ranks has shape
+        (n_groups, n_models, n_windows) and rank 1 is best. Windows where a
+        model has no score rank after every scored model.
+    """
+    groups = sorted({(crypto, horizon) for crypto, horizon, _ in keys})
+    models = sorted({model for _, _, model in keys})
+    group_index = {group: i for i, group in enumerate(groups)}
+    model_index = {model: i for i, model in enumerate(models)}
+
+    values = _ranking_scores(metrics[rank_metric], rank_metric)
+    table = np.full((len(groups), len(models), values.shape[1]), np.inf)
+
+    for row, (crypto, horizon, model) in enumerate(keys):
+        table[group_index[(crypto, horizon)], model_index[model]] = values[row]
+
+    # argsort of argsort turns scores into 0-based ranks along the model axis
+    ranks = np.argsort(np.argsort(table, axis=1, kind="stable"), axis=1, kind="stable") + 1
+
+    return groups, models, ranks
+
+
+def build_comparison_table(metrics, keys, rank_metric="mae"):
+    """Regenerate the crypto_forecasting_comparisons.json rank table.
+
+    Models are ranked on the window-averaged rank_metric for each
+    (crypto, horizon) group. Each entry also carries every model's rank
+    averaged over the sliding windows (from rank_models).
+    """
+    row_index = {key: row for row, key in enumerate(keys)}
+    groups, models, window_ranks = rank_models(metrics, keys, rank_metric)
+
+    with np.errstate(invalid="ignore"):
+        summary = {
+            name: np.array([np.nan if np.isnan(v).all() else np.nanmean(v) for v in values])
+            for name, values in metrics.items()
+        }
+
+    comparisons = []
+
+    for group_number, (crypto, horizon) in enumerate(groups):
+        present = [m for m in models if (crypto, horizon, m) in row_index]
+        scores = np.array([summary[rank_metric][row_index[(crypto, horizon, m)]] for m in present])
+        order = np.argsort(_ranking_scores(scores, rank_metric), kind="stable")
+
+        entry = {"crypto": crypto, "horizon_days": int(horizon)}
+        for rank, position in enumerate(order, start=1):
+            entry[f"{present[position].lower()}_rank"] = rank
+
+        best_row = row_index[(crypto, horizon, present[order[0]])]
+        entry["best_model"] = present[order[0]]
+        entry[f"best_{rank_metric}"] = float(summary[rank_metric][best_row])
+        entry["best_direction_accuracy"] = float(summary["direction_accuracy"][best_row])
+
+        for model in present:
+            model_ranks = window_ranks[group_number, models.index(model)]
+            entry[f"{model.lower()}_mean_window_rank"] = float(model_ranks.mean())
+
+        comparisons.append(entry)
+
+    return comparisons
+
+
+def load_forecast_frame(path):
+    """Load long-format forecasts into stacked arrays.
+
+    The CSV must have columns date, crypto, horizon_days, model, actual and
+    predicted. All series are aligned on the union of dates; gaps become NaN.
+
+    Returns:
+        Tuple of (keys, actual, predicted) with keys a list of
+        (crypto, horizon_days, model) tuples matching the array rows.
+    """
+    df = pd.read_csv(path, parse_dates=["date"])
+    index_cols = ["crypto", "horizon_days", "model"]
+
+    actual = df.pivot_table(index=index_cols, columns="date", values="actual", aggfunc="last")
+    predicted = df.pivot_table(index=index_cols, columns="date", values="predicted", aggfunc="last")
+    predicted = predicted.reindex(index=actual.index, columns=actual.columns)
+
+    keys = [(crypto, int(horizon), model) for crypto, horizon, model in actual.index]
+
+    return keys, actual.to_numpy(dtype=np.float64), predicted.to_numpy(dtype=np.float64)
+
+
+def generate_synthetic_forecasts(
+    cryptos=("BTC", "ETH", "SOL"),
+    horizons=(1, 7, 30),
+    models=("SpiralBrain", "ARIMA", "XGBoost", "Prophet"),
+    n_days=365 * 3,
+    seed=42,
+):
+    """Generate random-walk prices with model forecasts of varying noise levels."""
+    rng = np.random.default_rng(seed)
+    start_prices = {"BTC": 60000.0, "ETH": 3000.0, "SOL": 150.0}
+
+    keys = []
+    actual_rows = []
+    predicted_rows = []
+
+    for crypto in cryptos:
+        log_returns = rng.normal(0.0005, 0.03, n_days)
+        prices = start_prices.get(crypto, 100.0) * np.exp(np.cumsum(log_returns))
+
+        for horizon in horizons:
+            for noise, model in zip(np.linspace(0.01, 0.05, len(models)), models, strict=False):
+                error = rng.normal(0.0, noise * np.sqrt(horizon) / 2, n_days)
+                keys.append((crypto, horizon, model))
+                actual_rows.append(prices)
+                predicted_rows.append(prices * (1.0 + error))
+
+    return keys, np.vstack(actual_rows), np.vstack(predicted_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--input",
+        help="Long-format CSV (date, crypto, horizon_days, model, actual, predicted); "
+        "synthetic data is generated when omitted",
+    )
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--rank-metric", default="mae", choices=METRICS)
+    parser.add_argument("--output", default="results/crypto_forecasting/rolling_comparisons.json")
+    args = parser.parse_args()
+
+    if args.input:
+        keys, actual, predicted = load_forecast_frame(args.input)
+    else:
+        keys, actual, predicted = generate_synthetic_forecasts()
+
+    print("📈 Rolling-window crypto forecast evaluation")
+    print(f"   Series: {len(keys)}  Days: {actual.shape[1]}  Window: {args.window}")
+
+    metrics = rolling_forecast_metrics(actual, predicted, window=args.window)
+    comparisons = build_comparison_table(metrics, keys, rank_metric=args.rank_metric)
+
+    for entry in comparisons:
+        print(
+            f"  {entry['crypto']:<5} {entry['horizon_days']:>3}d  best={entry['best_model']:<12} "
+            f"{args.rank_metric}={entry['best_' + args.rank_metric]:.4f}"
+        )
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(comparisons, f, indent=2)
+
+    print(f"✅ Rank table saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
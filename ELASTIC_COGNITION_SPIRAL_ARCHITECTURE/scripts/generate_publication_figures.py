@@ -4,23 +4,38 @@ Publication-quality figure generation for SpiralBrain journal submission.
 Creates figures for cognition spiral, cognitive capabilities, and neurodivergent validation.
 """
 
+import argparse
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-import numpy as np
-import seaborn as sns
-from matplotlib.patches import Circle
+from profiling import StageProfiler, add_profiling_arguments
 
-# Set publication-quality style
-plt.style.use('seaborn-v0_8-paper')
-sns.set_palette("husl")
+# Default output directory (created by main, not at import time)
+FIGURES_DIR = Path("publication_package/figures")
 
-# Create figures directory
-figures_dir = Path("publication_package/figures")
-figures_dir.mkdir(exist_ok=True)
+_style_applied = False
 
-def create_spiral_cognition_figure():
+
+def _pyplot():
+    """Import pyplot lazily and apply the publication-quality style on first use."""
+    global _style_applied
+
+    import matplotlib.pyplot as plt
+
+    if not _style_applied:
+        import seaborn as sns
+
+        plt.style.use('seaborn-v0_8-paper')
+        sns.set_palette("husl")
+        _style_applied = True
+
+    return plt
+
+def create_spiral_cognition_figure(figures_dir=FIGURES_DIR):
     """Create the spiral cognition manifold figure."""
+    plt = _pyplot()
+    import numpy as np
+
+    figures_dir = Path(figures_dir)
     # λ-sweep data (from empirical results)
     lambda_values = np.array([0.00, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40,
                              0.45, 0.50, 0.55, 0.60, 0.65, 0.70, 0.75, 0.80, 0.85, 0.90, 0.95, 1.00])
@@ -63,8 +78,12 @@ def create_spiral_cognition_figure():
     plt.savefig(figures_dir / 'spiral_coherence_manifold.pdf', bbox_inches='tight')
     plt.close()
 
-def create_cognitive_capabilities_radar():
+def create_cognitive_capabilities_radar(figures_dir=FIGURES_DIR):
     """Create radar chart comparing SpiralBrain vs Traditional ML capabilities."""
+    plt = _pyplot()
+    import numpy as np
+
+    figures_dir = Path(figures_dir)
     # Cognitive capabilities data
     categories = ['Multimodal\nReasoning', 'Emotional\nCognition', 'Contextual\nContinuity',
                  'Creative\nDivergence', 'Ethical\nReasoning', 'Self-\nRegulation']
@@ -106,8 +125,12 @@ def create_cognitive_capabilities_radar():
     plt.savefig(figures_dir / 'cognitive_capabilities_radar.pdf', bbox_inches='tight')
     plt.close()
 
-def create_neurodivergent_validation_figure():
+def create_neurodivergent_validation_figure(figures_dir=FIGURES_DIR):
     """Create figure showing neurodivergent design validation through emotional regulation stability."""
+    plt = _pyplot()
+    import numpy as np
+
+    figures_dir = Path(figures_dir)
     # Load homeostasis cycle data (simulated based on real results)
     cycles = np.arange(1, 51)  # 50 cycles
     sec_drift = np.array([
@@ -158,8 +181,12 @@ def create_neurodivergent_validation_figure():
     plt.savefig(figures_dir / 'neurodivergent_validation.pdf', bbox_inches='tight')
     plt.close()
 
-def create_four_lobe_architecture_diagram():
+def create_four_lobe_architecture_diagram(figures_dir=FIGURES_DIR):
     """Create a conceptual diagram of the four-lobe architecture."""
+    plt = _pyplot()
+    from matplotlib.patches import Circle
+
+    figures_dir = Path(figures_dir)
     fig, ax = plt.subplots(figsize=(12, 8))
 
     # Define lobe positions and properties
@@ -210,8 +237,12 @@ def create_four_lobe_architecture_diagram():
     plt.savefig(figures_dir / 'four_lobe_architecture.pdf', bbox_inches='tight')
     plt.close()
 
-def create_hypothesis_validation_summary():
+def create_hypothesis_validation_summary(figures_dir=FIGURES_DIR):
     """Create a summary figure of hypothesis testing results."""
+    plt = _pyplot()
+    import numpy as np
+
+    figures_dir = Path(figures_dir)
     hypotheses = [
         'Reflective Homeostasis',
         'Elastic Coupling',
@@ -263,24 +294,30 @@ def create_hypothesis_validation_summary():
     plt.savefig(figures_dir / 'hypothesis_validation_summary.pdf', bbox_inches='tight')
     plt.close()
 
-def main():
-    """Generate all publication figures."""
-    print("Generating publication-quality figures for SpiralBrain journal submission...")
+# Figure name -> (generator, progress message), in generation order
+FIGURES = {
+    "spiral": (create_spiral_cognition_figure, "✓ Created spiral cognition manifold figure"),
+    "radar": (create_cognitive_capabilities_radar, "✓ Created cognitive capabilities radar chart"),
+    "neurodivergent": (create_neurodivergent_validation_figure, "✓ Created neurodivergent validation figure"),
+    "architecture": (create_four_lobe_architecture_diagram, "✓ Created four-lobe architecture diagram"),
+    "hypothesis": (create_hypothesis_validation_summary, "✓ Created hypothesis validation summary"),
+}
 
-    create_spiral_cognition_figure()
-    print("✓ Created spiral cognition manifold figure")
 
-    create_cognitive_capabilities_radar()
-    print("✓ Created cognitive capabilities radar chart")
-
-    create_neurodivergent_validation_figure()
-    print("✓ Created neurodivergent validation figure")
+def main(figures_dir=FIGURES_DIR, only=None, profiler=None):
+    """Generate all publication figures (or just those named in only)."""
+    print("Generating publication-quality figures for SpiralBrain journal submission...")
 
-    create_four_lobe_architecture_diagram()
-    print("✓ Created four-lobe architecture diagram")
+    profiler = profiler or StageProfiler()
+    figures_dir = Path(figures_dir)
+    figures_dir.mkdir(parents=True, exist_ok=True)
 
-    create_hypothesis_validation_summary()
-    print("✓ Created hypothesis validation summary")
+    for name, (create_figure, message) in FIGURES.items():
+        if only and name not in only:
+            continue
+        with profiler.stage(create_figure.__name__):
+            create_figure(figures_dir)
+        print(message)
 
     print(f"\nAll figures saved to: {figures_dir}")
     print("Generated files:")
@@ -289,5 +326,17 @@ def main():
     for f in figures_dir.glob("*.pdf"):
         print(f"  - {f.name}")
 
+    profiler.finish()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate SpiralBrain publication figures")
+    parser.add_argument("--output-dir", default=str(FIGURES_DIR))
+    parser.add_argument("--only", nargs="+", choices=list(FIGURES), help="Generate only these figures")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    main(
+        figures_dir=args.output_dir,
+        only=args.only,
+        profiler=StageProfiler.from_args(args, prefix="figures"),
+    )
\ No newline at end of file
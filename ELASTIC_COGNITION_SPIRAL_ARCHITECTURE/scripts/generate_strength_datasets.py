@@ -5,15 +5,19 @@ Creates a dataset combining numeric financial data with text customer notes
 for testing SpiralCortex's multimodal reasoning capabilities.
 """
 
+import argparse
 import json
 import os
 import random
 
-import pandas as pd
+from profiling import StageProfiler, add_profiling_arguments
 
 
 def generate_multimodal_finance_dataset(n_samples=1000, output_file="data/multimodal_finance.csv"):
     """Generate a multimodal finance dataset with text + numeric features."""
+    # pandas is only needed for the CSV export; importing it lazily keeps the
+    # JSON-only emotional reasoning generator fast to start
+    import pandas as pd
 
     # Define risk categories and their characteristics
     risk_profiles = {
@@ -143,7 +147,7 @@ def generate_multimodal_finance_dataset(n_samples=1000, output_file="data/multim
     df = pd.DataFrame(data)
 
     # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
 
     df.to_csv(output_file, index=False)
     print(f"✅ Generated multimodal finance dataset with {n_samples} samples")
@@ -153,118 +157,123 @@ def generate_multimodal_finance_dataset(n_samples=1000, output_file="data/multim
     return df
 
 
-def generate_emotional_reasoning_dataset(
-    n_samples=500, output_file="data/emotional_reasoning.json"
-):
-    """Generate emotional reasoning dataset for SEC vector testing."""
-
-    # Emotion categories with intensity levels
-    emotions = {
-        "joy": ["happy", "excited", "content", "peaceful", "grateful"],
-        "sadness": ["sad", "disappointed", "lonely", "hopeless", "depressed"],
-        "anger": ["angry", "frustrated", "irritated", "furious", "enraged"],
-        "fear": ["anxious", "scared", "worried", "terrified", "panicked"],
-        "surprise": ["shocked", "amazed", "astonished", "startled", "bewildered"],
-        "disgust": ["repulsed", "grossed out", "sickened", "appalled", "revolted"],
-        "anticipation": ["expectant", "hopeful", "optimistic", "eager", "enthusiastic"],
-        "trust": ["confident", "faithful", "loyal", "reliable", "dependable"],
-    }
-
-    # Mixed emotion scenarios
-    mixed_emotions = [
-        ("joy", "anticipation", "Excited about tomorrow but nervous"),
-        ("sadness", "anger", "Disappointed and frustrated with the situation"),
-        ("fear", "anticipation", "Anxious yet hopeful about the future"),
-        ("surprise", "joy", "Shocked but pleased with the outcome"),
-        ("trust", "fear", "Confident despite some worries"),
-        ("disgust", "anger", "Repulsed and outraged by the behavior"),
-        ("sadness", "trust", "Sad but still believing things will improve"),
-        ("joy", "surprise", "Happy and amazed at the same time"),
-    ]
-
-    # Text templates for different emotional contexts
-    text_templates = {
-        "personal": [
-            "I feel {} about {}",
-            "I'm experiencing {} regarding {}",
-            "This situation makes me feel {}",
-            "{} is how I feel when I think about {}",
-        ],
-        "social": [
-            "When {} happens, I feel {}",
-            "Interacting with {} makes me feel {}",
-            "The way {} treated me left me feeling {}",
-            "Being around {} gives me a sense of {}",
-        ],
-        "professional": [
-            "At work, I feel {} about {}",
-            "The project makes me feel {}",
-            "Dealing with {} at the office leaves me {}",
-            "My job situation has me feeling {}",
-        ],
-    }
-
-    data = []
-
+# Emotion categories with intensity levels
+EMOTIONS = {
+    "joy": ["happy", "excited", "content", "peaceful", "grateful"],
+    "sadness": ["sad", "disappointed", "lonely", "hopeless", "depressed"],
+    "anger": ["angry", "frustrated", "irritated", "furious", "enraged"],
+    "fear": ["anxious", "scared", "worried", "terrified", "panicked"],
+    "surprise": ["shocked", "amazed", "astonished", "startled", "bewildered"],
+    "disgust": ["repulsed", "grossed out", "sickened", "appalled", "revolted"],
+    "anticipation": ["expectant", "hopeful", "optimistic", "eager", "enthusiastic"],
+    "trust": ["confident", "faithful", "loyal", "reliable", "dependable"],
+}
+
+# Mixed emotion scenarios
+MIXED_EMOTIONS = [
+    ("joy", "anticipation", "Excited about tomorrow but nervous"),
+    ("sadness", "anger", "Disappointed and frustrated with the situation"),
+    ("fear", "anticipation", "Anxious yet hopeful about the future"),
+    ("surprise", "joy", "Shocked but pleased with the outcome"),
+    ("trust", "fear", "Confident despite some worries"),
+    ("disgust", "anger", "Repulsed and outraged by the behavior"),
+    ("sadness", "trust", "Sad but still believing things will improve"),
+    ("joy", "surprise", "Happy and amazed at the same time"),
+]
+
+# Text templates for different emotional contexts
+TEXT_TEMPLATES = {
+    "personal": [
+        "I feel {} about {}",
+        "I'm experiencing {} regarding {}",
+        "This situation makes me feel {}",
+        "{} is how I feel when I think about {}",
+    ],
+    "social": [
+        "When {} happens, I feel {}",
+        "Interacting with {} makes me feel {}",
+        "The way {} treated me left me feeling {}",
+        "Being around {} gives me a sense of {}",
+    ],
+    "professional": [
+        "At work, I feel {} about {}",
+        "The project makes me feel {}",
+        "Dealing with {} at the office leaves me {}",
+        "My job situation has me feeling {}",
+    ],
+}
+
+CONTEXT_WORDS = {
+    "personal": [
+        "my future",
+        "this decision",
+        "my health",
+        "family matters",
+        "personal goals",
+    ],
+    "social": [
+        "my friends",
+        "new people",
+        "family gatherings",
+        "social events",
+        "relationships",
+    ],
+    "professional": [
+        "my career",
+        "the deadline",
+        "my colleagues",
+        "performance reviews",
+        "work challenges",
+    ],
+}
+
+# Nuance or contradiction suffixes appended to some texts
+CONTRADICTIONS = [
+    ", though I'm trying to stay positive",
+    ", even though logically it should be fine",
+    ", despite what others might think",
+    ", which surprises even me",
+    ", though I know it's irrational",
+]
+
+
+def sample_emotional_reasoning_rows(n_samples=500):
+    """Sample emotional reasoning rows with the text kept as vocabulary indices.
+
+    Each row carries ``text_parts`` = (template index within its context,
+    emotion word index within the primary emotion, context phrase index
+    within its context, contradiction index or None) instead of the
+    materialized string; format_emotional_text() turns it into text.
+    """
     for _ in range(n_samples):
         # Decide if this is a pure emotion or mixed emotion
         is_mixed = random.random() < 0.4  # 40% mixed emotions
 
         if is_mixed:
-            primary_emotion, secondary_emotion, description = random.choice(mixed_emotions)
+            primary_emotion, secondary_emotion, description = random.choice(MIXED_EMOTIONS)
             emotion_label = f"{primary_emotion}_{secondary_emotion}"
             intensity_primary = random.uniform(0.6, 1.0)
             intensity_secondary = random.uniform(0.3, 0.7)
         else:
-            primary_emotion = random.choice(list(emotions.keys()))
+            primary_emotion = random.choice(list(EMOTIONS.keys()))
             emotion_label = primary_emotion
             intensity_primary = random.uniform(0.5, 1.0)
             intensity_secondary = 0.0
             secondary_emotion = None
 
-        # Choose context and generate text
+        # Choose context and template (indices consume the RNG exactly like
+        # random.choice on the underlying lists)
         context = random.choice(["personal", "social", "professional"])
-        template = random.choice(text_templates[context])
+        template_index = random.choice(range(len(TEXT_TEMPLATES[context])))
 
         # Fill in template with emotion words and context
-        emotion_word = random.choice(emotions[primary_emotion])
-        context_words = {
-            "personal": [
-                "my future",
-                "this decision",
-                "my health",
-                "family matters",
-                "personal goals",
-            ],
-            "social": [
-                "my friends",
-                "new people",
-                "family gatherings",
-                "social events",
-                "relationships",
-            ],
-            "professional": [
-                "my career",
-                "the deadline",
-                "my colleagues",
-                "performance reviews",
-                "work challenges",
-            ],
-        }
-
-        context_phrase = random.choice(context_words[context])
-        text = template.format(emotion_word, context_phrase)
+        word_index = random.choice(range(len(EMOTIONS[primary_emotion])))
+        phrase_index = random.choice(range(len(CONTEXT_WORDS[context])))
 
         # Add some nuance or contradiction
+        suffix_index = None
         if random.random() < 0.3:
-            contradictions = [
-                ", though I'm trying to stay positive",
-                ", even though logically it should be fine",
-                ", despite what others might think",
-                ", which surprises even me",
-                ", though I know it's irrational",
-            ]
-            text += random.choice(contradictions)
+            suffix_index = random.choice(range(len(CONTRADICTIONS)))
 
         # Create SEC vector (simplified 8-dimensional representation)
         sec_vector = {
@@ -286,8 +295,8 @@ def generate_emotional_reasoning_dataset(
         if secondary_emotion:
             sec_vector[secondary_emotion] = intensity_secondary
 
-        row = {
-            "text": text,
+        yield {
+            "text_parts": (template_index, word_index, phrase_index, suffix_index),
             "primary_emotion": primary_emotion,
             "secondary_emotion": secondary_emotion,
             "emotion_label": emotion_label,
@@ -298,10 +307,38 @@ def generate_emotional_reasoning_dataset(
             "is_mixed_emotion": is_mixed,
         }
 
+
+def format_emotional_text(context, primary_emotion, text_parts):
+    """Materialize the text for a row sampled by sample_emotional_reasoning_rows."""
+    template_index, word_index, phrase_index, suffix_index = text_parts
+
+    template = TEXT_TEMPLATES[context][template_index]
+    text = template.format(EMOTIONS[primary_emotion][word_index], CONTEXT_WORDS[context][phrase_index])
+
+    if suffix_index is not None:
+        text += CONTRADICTIONS[suffix_index]
+
+    return text
+
+
+def generate_emotional_reasoning_dataset(
+    n_samples=500, output_file="data/emotional_reasoning.json"
+):
+    """Generate emotional reasoning dataset for SEC vector testing."""
+
+    data = []
+
+    for sample in sample_emotional_reasoning_rows(n_samples):
+        text_parts = sample.pop("text_parts")
+        row = {
+            "text": format_emotional_text(sample["context"], sample["primary_emotion"], text_parts),
+            **sample,
+        }
+
         data.append(row)
 
     # Save as JSON
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
 
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
@@ -321,6 +358,15 @@ def generate_emotional_reasoning_dataset(
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate SpiralBrain strength-test datasets")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    profiler = StageProfiler.from_args(args, prefix="datasets")
+
     # Generate both datasets
-    multimodal_df = generate_multimodal_finance_dataset()
-    emotional_data = generate_emotional_reasoning_dataset()
+    with profiler.stage("generate_multimodal_finance_dataset"):
+        multimodal_df = generate_multimodal_finance_dataset()
+    with profiler.stage("generate_emotional_reasoning_dataset"):
+        emotional_data = generate_emotional_reasoning_dataset()
+
+    profiler.finish()
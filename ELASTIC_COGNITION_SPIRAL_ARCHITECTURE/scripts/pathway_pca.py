@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Streaming Pathway Weight Covariance and PCA
+
+Tracks how the eight pathway_weights of brain_trace.jsonl ticks co-vary over
+long runs without loading the trace. Ticks are read in chunks (from JSONL or
+a trace_archive .sbta file) and folded into a running mean and covariance,
+optionally with exponential forgetting so recent ticks dominate. Principal
+components come from the running covariance at any point, and fixed-size
+windows of ticks produce snapshots of both the window's own components and
+the cumulative ones.
+
+Partial states merge exactly (Chan et al. pairwise update), so several trace
+files can be analyzed in worker processes and combined afterwards.
+"""
+
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PATHWAYS = [
+    "Reasoning",
+    "Attention",
+    "InductiveMemory",
+    "DeductiveMemory",
+    "Creative",
+    "Analytical",
+    "Social",
+    "Temporal",
+]
+
+
+class RunningCovariance:
+    """Weighted running mean and scatter matrix of fixed-dimension vectors.
+
+    forgetting is the per-sample decay factor (e.g. 0.999); each new sample
+    multiplies the weight of everything before it by that factor. With
+    forgetting=None every sample has weight 1 and the statistics are exact.
+    """
+
+    def __init__(self, dim=len(PATHWAYS), forgetting=None):
+        self.dim = dim
+        self.forgetting = forgetting
+        self.count = 0
+        self.weight = 0.0
+        self.mean = np.zeros(dim)
+        self.scatter = np.zeros((dim, dim))
+
+    @classmethod
+    def from_batch(cls, x, forgetting=None):
+        """State for a (n, dim) batch, with forgetting applied across its rows."""
+        x = np.asarray(x, dtype=np.float64)
+        state = cls(x.shape[1], forgetting)
+        n = len(x)
+        if not n:
+            return state
+
+        if forgetting is None:
+            weights = None
+            state.weight = float(n)
+            state.mean = x.mean(axis=0)
+        else:
+            # Newest row has weight 1, the one before it forgetting, ...
+            weights = forgetting ** np.arange(n - 1, -1, -1, dtype=np.float64)
+            state.weight = float(weights.sum())
+            state.mean = weights @ x / state.weight
+
+        centered = x - state.mean
+        weighted = centered if weights is None else centered * weights[:, None]
+        state.scatter = weighted.T @ centered
+        state.count = n
+        return state
+
+    def merge(self, other):
+        """Fold in a state for samples that come after this one's."""
+        if not other.count:
+            return self
+        if self.forgetting is not None:
+            # Everything seen so far ages by the number of newer samples
+            decay = self.forgetting ** other.count
+            self.weight *= decay
+            self.scatter = self.scatter * decay
+
+        total = self.weight + other.weight
+        delta = other.mean - self.mean
+        self.scatter = self.scatter + other.scatter + np.outer(delta, delta) * (self.weight * other.weight / total)
+        self.mean = self.mean + delta * (other.weight / total)
+        self.weight = total
+        self.count += other.count
+        return self
+
+    def update(self, x):
+        """Add a (n, dim) batch of samples."""
+        return self.merge(RunningCovariance.from_batch(x, self.forgetting))
+
+    @property
+    def covariance(self):
+        """Sample covariance (unbiased without forgetting, weighted otherwise)."""
+        if self.forgetting is None:
+            denominator = self.weight - 1.0
+        else:
+            denominator = self.weight
+        if denominator <= 0:
+            return np.full((self.dim, self.dim), np.nan)
+        return self.scatter / denominator
+
+    def principal_components(self, k=None):
+        """(explained variances, components) sorted by variance, components as rows.
+
+        Each component's sign is fixed so its largest-magnitude loading is
+        positive, which keeps successive snapshots comparable.
+        """
+        covariance = self.covariance
+        if np.isnan(covariance).any():
+            return np.full(self.dim, np.nan)[:k], np.full((self.dim, self.dim), np.nan)[:k]
+
+        values, vectors = np.linalg.eigh(covariance)
+        order = np.argsort(values)[::-1][:k]
+        values = np.clip(values[order], 0.0, None)
+        components = vectors[:, order].T
+
+        signs = np.sign(components[np.arange(len(components)), np.abs(components).argmax(axis=1)])
+        return values, components * signs[:, None]
+
+    def summary(self, k=3):
+        """JSON-ready summary; components are None while fewer than 2 samples are seen."""
+        summary = {
+            "count": self.count,
+            "mean": dict(zip(PATHWAYS, self.mean.tolist(), strict=False)) if self.count else None,
+            "degenerate": self.count < 2,
+            "explained_variance": None,
+            "explained_variance_ratio": None,
+            "components": None,
+        }
+        if summary["degenerate"]:
+            return summary
+
+        values, components = self.principal_components()
+        total = values.sum()
+        summary["explained_variance"] = values[:k].tolist()
+        summary["explained_variance_ratio"] = (values[:k] / total).tolist() if total > 0 else None
+        summary["components"] = [dict(zip(PATHWAYS, c.tolist(), strict=False)) for c in components[:k]]
+        return summary
+
+
+def iter_weight_chunks(path, chunk_size=10000):
+    """Yield (t_rel, weights) arrays from a JSONL trace or .sbta trace archive.
+
+    Ticks missing any pathway weight are skipped.
+    """
+    if path.endswith(".sbta"):
+        from trace_archive import TraceArchive
+
+        archive = TraceArchive(path)
+        record_chunks = (archive.read_chunk(i) for i in range(len(archive.chunks)))
+    else:
+        def _lines():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+        lines = _lines()
+        record_chunks = iter(lambda: list(itertools.islice(lines, chunk_size)), [])
+
+    for records in record_chunks:
+        t_rel = np.empty(len(records))
+        weights = np.full((len(records), len(PATHWAYS)), np.nan)
+        for i, record in enumerate(records):
+            t_rel[i] = record.get("t_rel", np.nan)
+            pathway_weights = (record.get("active_pathways") or {}).get("pathway_weights") or {}
+            for j, pathway in enumerate(PATHWAYS):
+                value = pathway_weights.get(pathway)
+                if value is not None:
+                    weights[i, j] = value
+
+        complete = ~np.isnan(weights).any(axis=1)
+        yield t_rel[complete], weights[complete]
+
+
+class PathwayCovarianceAnalyzer:
+    """Cumulative running covariance plus snapshots every `window` ticks."""
+
+    def __init__(self, window=1000, forgetting=None, n_components=3):
+        if window < 1:
+            raise ValueError(f"window must be at least 1 tick, got {window}")
+        self.window = window
+        self.n_components = n_components
+        self.total = RunningCovariance(forgetting=forgetting)
+        self.snapshots = []
+        self._window_state = RunningCovariance()
+        self._window_t = None
+        self._last_t = None
+
+    def update(self, t_rel, weights):
+        start = 0
+        while start < len(weights):
+            take = min(self.window - self._window_state.count, len(weights) - start)
+            batch = weights[start : start + take]
+            self.total.update(batch)
+            self._window_state.update(batch)
+            if self._window_t is None:
+                self._window_t = float(t_rel[start])
+            start += take
+
+            self._last_t = float(t_rel[start - 1])
+            if self._window_state.count == self.window:
+                self._snapshot(self._last_t)
+
+    def _snapshot(self, t_end):
+        window = self._window_state.summary(self.n_components)
+        cumulative = self.total.summary(self.n_components)
+        self.snapshots.append(
+            {
+                "index": len(self.snapshots),
+                # Ticks without t_rel read as NaN; report them as unknown
+                "t_start": None if self._window_t is None or np.isnan(self._window_t) else self._window_t,
+                "t_end": None if t_end is None or np.isnan(t_end) else t_end,
+                "window": window,
+                "cumulative": {key: cumulative[key] for key in ("count", "explained_variance_ratio", "components")},
+            }
+        )
+        self._window_state = RunningCovariance()
+        self._window_t = None
+
+    def finish(self):
+        """Snapshot a trailing partial window, if any.
+
+        A trailing window of a single tick has no covariance; its snapshot is
+        marked degenerate with null components.
+        """
+        if self._window_state.count:
+            self._snapshot(self._last_t)
+        return self
+
+
+def analyze_file(path, window=1000, forgetting=None, n_components=3, chunk_size=10000):
+    analyzer = PathwayCovarianceAnalyzer(window, forgetting, n_components)
+    for t_rel, weights in iter_weight_chunks(path, chunk_size):
+        analyzer.update(t_rel, weights)
+    return analyzer.finish()
+
+
+def analyze_files(paths, window=1000, forgetting=None, n_components=3, workers=None):
+    """Analyze trace files in worker processes; merge cumulative states in path order.
+
+    Returns (merged RunningCovariance, [{"input": path, "snapshots": [...]}]),
+    one entry per input in order, so a path passed twice is reported twice.
+    """
+    merged = RunningCovariance(forgetting=forgetting)
+    snapshots = []
+    args = [(path, window, forgetting, n_components) for path in paths]
+
+    if workers == 1 or len(paths) == 1:
+        analyzers = [analyze_file(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            analyzers = list(executor.map(analyze_file, *zip(*args, strict=False)))
+
+    for path, analyzer in zip(paths, analyzers, strict=False):
+        merged.merge(analyzer.total)
+        snapshots.append({"input": path, "snapshots": analyzer.snapshots})
+    return merged, snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="brain_trace JSONL files or .sbta archives")
+    parser.add_argument("--window", type=int, default=1000, help="Ticks per snapshot window")
+    parser.add_argument("--forgetting", type=float, help="Per-tick decay factor, e.g. 0.999")
+    parser.add_argument("--components", type=int, default=3)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", help="Write summary and snapshots JSON to this path")
+    args = parser.parse_args()
+    if args.window < 1:
+        parser.error("--window must be at least 1")
+
+    merged, snapshots = analyze_files(args.inputs, args.window, args.forgetting, args.components, args.workers)
+    summary = merged.summary(args.components)
+
+    print(f"✅ Analyzed {summary['count']} ticks from {len(args.inputs)} file(s)")
+    if summary["explained_variance_ratio"]:
+        for i, (ratio, component) in enumerate(
+            zip(summary["explained_variance_ratio"], summary["components"], strict=False), start=1
+        ):
+            top = sorted(component.items(), key=lambda item: -abs(item[1]))[:3]
+            loadings = ", ".join(f"{name} {value:+.2f}" for name, value in top)
+            print(f"   PC{i}: {ratio:.1%} of variance ({loadings})")
+    print(f"   Snapshots: {sum(len(entry['snapshots']) for entry in snapshots)} windows of {args.window} ticks")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "snapshots": snapshots}, f, indent=2, allow_nan=False)
+        print(f"   Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Stage Profiling Hooks
+
+Shared --profile / --trace-memory support for the figure, dataset and
+publication package entry points. Work is wrapped in named stages (one per
+create_* figure, dataset generator or PublicationPackager step); for each
+stage the profiler records wall and CPU time and, when enabled:
+
+- cProfile stats, written as <prefix>.<stage>.pstats plus a combined
+  <prefix>.pstats,
+- sampled call stacks in collapsed format (<prefix>.collapsed), usable by
+  flamegraph.pl, speedscope or inferno,
+- tracemalloc peak memory and top allocation sites (<prefix>.memory.txt).
+
+A per-stage wall/CPU/memory table is printed at the end of the run.
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+# Keep the profiler's own bookkeeping out of the allocation reports
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+def add_profiling_arguments(parser):
+    """Add the standard --profile/--trace-memory options to an argparse parser."""
+    parser.add_argument("--profile", action="store_true", help="Capture cProfile stats and sampled stacks per stage")
+    parser.add_argument("--trace-memory", action="store_true", help="Capture tracemalloc peaks and top allocations per stage")
+    parser.add_argument("--profile-dir", default="profiles", help="Directory for profiling output")
+    return parser
+
+
+class _StackSampler(threading.Thread):
+    """Samples the profiled thread's Python stack at a fixed interval."""
+
+    def __init__(self, profiler, thread_id, interval):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.profiler = profiler
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._labels = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            stage = self.profiler.current_stage
+            frame = sys._current_frames().get(self.thread_id)
+            if stage is None or frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = self._labels.get(code)
+                if label is None:
+                    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    self._labels[code] = label
+                stack.append(label)
+                frame = frame.f_back
+
+            # Root the stack at the stage so flamegraphs group by stage
+            stack.append(stage)
+            self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class StageProfiler:
+    """Collects per-stage timing, cProfile and tracemalloc data."""
+
+    def __init__(
+        self,
+        profile: bool = False,
+        trace_memory: bool = False,
+        output_dir="profiles",
+        prefix: str = "run",
+        top_allocations: int = 10,
+        sample_interval: float = 0.005,
+    ):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.output_dir = Path(output_dir)
+        self.prefix = prefix
+        self.top_allocations = top_allocations
+        self.sample_interval = sample_interval
+
+        self.stages = []
+        self.current_stage = None
+        self._sampler = None
+
+    @classmethod
+    def from_args(cls, args, prefix):
+        """Build a profiler from parsed add_profiling_arguments options."""
+        return cls(
+            profile=args.profile,
+            trace_memory=args.trace_memory,
+            output_dir=args.profile_dir,
+            prefix=prefix,
+        )
+
+    @property
+    def enabled(self):
+        return self.profile or self.trace_memory
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the enclosed block as one named stage."""
+        result = {"name": name}
+        profiler = None
+        snapshot_before = None
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            snapshot_before = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+        if self.profile:
+            if self._sampler is None:
+                self._sampler = _StackSampler(self, threading.get_ident(), self.sample_interval)
+                self._sampler.start()
+            profiler = cProfile.Profile()
+
+        self.current_stage = name
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler:
+            profiler.enable()
+
+        try:
+            yield result
+        finally:
+            if profiler:
+                profiler.disable()
+            result["wall_s"] = time.perf_counter() - wall_start
+            result["cpu_s"] = time.process_time() - cpu_start
+            self.current_stage = None
+
+            if profiler:
+                result["profile"] = profiler
+
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                result["peak_mb"] = (peak - memory_before) / (1024 * 1024)
+                result["retained_mb"] = (current - memory_before) / (1024 * 1024)
+                snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+                result["top_allocations"] = snapshot.compare_to(snapshot_before, "lineno")[
+                    : self.top_allocations
+                ]
+
+            self.stages.append(result)
+
+    def _stage_filename(self, name, suffix):
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+        return self.output_dir / f"{self.prefix}.{safe}{suffix}"
+
+    def write_outputs(self):
+        """Write pstats, collapsed stacks and memory reports; return written paths."""
+        if not self.enabled:
+            return []
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+
+        if self.profile:
+            if self._sampler is not None:
+                self._sampler.stop()
+
+            combined = None
+            for stage in self.stages:
+                if "profile" not in stage:
+                    continue
+                path = self._stage_filename(stage["name"], ".pstats")
+                stage["profile"].dump_stats(path)
+                written.append(path)
+
+                if combined is None:
+                    combined = pstats.Stats(stage["profile"])
+                else:
+                    combined.add(stage["profile"])
+
+            if combined is not None:
+                path = self.output_dir / f"{self.prefix}.pstats"
+                combined.dump_stats(path)
+                written.append(path)
+
+            collapsed_path = self.output_dir / f"{self.prefix}.collapsed"
+            samples = self._sampler.samples if self._sampler else {}
+            with open(collapsed_path, "w", encoding="utf-8") as f:
+                for stack, count in sorted(samples.items()):
+                    f.write(f"{stack} {count}\n")
+            written.append(collapsed_path)
+
+        if self.trace_memory:
+            memory_path = self.output_dir / f"{self.prefix}.memory.txt"
+            with open(memory_path, "w", encoding="utf-8") as f:
+                for stage in self.stages:
+                    f.write(f"== {stage['name']} (peak {stage['peak_mb']:.2f} MB) ==\n")
+                    for stat in stage["top_allocations"]:
+                        f.write(f"{stat}\n")
+                    f.write("\n")
+            written.append(memory_path)
+
+            tracemalloc.stop()
+
+        return written
+
+    def print_table(self):
+        """Print a per-stage wall/CPU/memory summary."""
+        if not self.enabled or not self.stages:
+            return
+
+        width = max(len("Stage"), *(len(stage["name"]) for stage in self.stages))
+        header = f"{'Stage':<{width}}  {'Wall (s)':>9}  {'CPU (s)':>9}"
+        if self.trace_memory:
+            header += f"  {'Peak (MB)':>10}  {'Retained (MB)':>13}"
+
+        print("\n📊 Stage profile")
+        print(header)
+        print("-" * len(header))
+
+        for stage in self.stages:
+            line = f"{stage['name']:<{width}}  {stage['wall_s']:>9.3f}  {stage['cpu_s']:>9.3f}"
+            if self.trace_memory:
+                line += f"  {stage['peak_mb']:>10.2f}  {stage['retained_mb']:>13.2f}"
+            print(line)
+
+        total_wall = sum(stage["wall_s"] for stage in self.stages)
+        total_cpu = sum(stage["cpu_s"] for stage in self.stages)
+        print("-" * len(header))
+        print(f"{'Total':<{width}}  {total_wall:>9.3f}  {total_cpu:>9.3f}")
+
+    def finish(self):
+        """Write all outputs and print the summary table."""
+        written = self.write_outputs()
+        self.print_table()
+
+        if written:
+            print(f"\nProfiling output written to: {self.output_dir}")
+            for path in written:
+                print(f"  - {Path(path).name}")
+
+        return written
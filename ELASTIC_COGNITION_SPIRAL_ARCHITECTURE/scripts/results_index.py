@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Cross-Run SQLite Results Index
+
+Ingests the scattered benchmark and stress-test outputs (COPA, EmoBench-M,
+emotion reasoning state tracker, crypto tax classifier, cognitive integrity
+benchmarks and full-brain stress *_test_results.json) into a local SQLite
+database, so cross-run questions become indexed queries instead of globbing
+and re-parsing every file.
+
+Schema:
+    runs     one row per ingested file (kind, path, mtime, size, run timestamp, test name)
+    metrics  every numeric scalar of a run, flattened to dotted names
+             (e.g. hazard_slope, physiological_envelope.coherence.mean)
+    copa_samples, emobench_tasks, tracker_trials, crypto_tax_predictions
+             per-kind item-level tables
+
+Only files that are new or whose mtime/size changed are (re-)ingested.
+
+Usage:
+    python results_index.py ingest                      # default result locations
+    python results_index.py metric hazard_slope --last 200
+    python results_index.py query "SELECT kind, COUNT(*) FROM runs GROUP BY kind"
+"""
+
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DB = REPO_ROOT / "ELASTIC_COGNITION_SPIRAL_ARCHITECTURE" / "results" / "results_index.sqlite"
+DEFAULT_SOURCES = [
+    "ELASTIC_COGNITION_SPIRAL_ARCHITECTURE/results/*.json",
+    "ARTICLE_EMOTION_CONTROL/data/full_brain_stress/*_test_results.json",
+]
+
+# Filename pattern -> result kind; first match wins
+KIND_PATTERNS = [
+    ("copa_evaluation_*.json", "copa"),
+    ("emobench_m_results*.json", "emobench_m"),
+    ("emotion_reasoning_state_tracker_*.json", "emotion_tracker"),
+    ("crypto_tax_classifier*_results_*.json", "crypto_tax"),
+    ("cognitive_integrity_benchmarks*.json", "cognitive_integrity"),
+    ("*_test_results.json", "stress_test"),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    test_name TEXT,
+    run_timestamp TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_kind_ts ON runs(kind, run_timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_test_ts ON runs(test_name, run_timestamp);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    test_name TEXT,
+    run_timestamp TEXT,
+    metric TEXT NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_metric_ts ON metrics(metric, run_timestamp);
+CREATE INDEX IF NOT EXISTS idx_metrics_test_metric ON metrics(test_name, metric, run_timestamp);
+CREATE INDEX IF NOT EXISTS idx_metrics_run ON metrics(run_id);
+
+CREATE TABLE IF NOT EXISTS copa_samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    sample_id INTEGER,
+    question_type TEXT,
+    category TEXT,
+    correct_label INTEGER,
+    predicted_label INTEGER,
+    correct INTEGER,
+    confidence REAL
+);
+CREATE INDEX IF NOT EXISTS idx_copa_run ON copa_samples(run_id);
+
+CREATE TABLE IF NOT EXISTS emobench_tasks (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT,
+    total INTEGER,
+    correct INTEGER,
+    accuracy REAL,
+    hazard_score REAL,
+    attention_scale REAL
+);
+CREATE INDEX IF NOT EXISTS idx_emobench_run ON emobench_tasks(run_id);
+CREATE INDEX IF NOT EXISTS idx_emobench_name ON emobench_tasks(name);
+
+CREATE TABLE IF NOT EXISTS tracker_trials (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    trial_index INTEGER,
+    perturbation TEXT,
+    emotional_stability REAL,
+    coherence REAL,
+    mmlu_accuracy REAL,
+    phi_max REAL,
+    phi_final REAL,
+    delta_ccs REAL,
+    epci REAL,
+    n_interventions INTEGER,
+    metacognitive_confidence REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tracker_run ON tracker_trials(run_id, trial_index);
+
+CREATE TABLE IF NOT EXISTS crypto_tax_predictions (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    transaction_id TEXT,
+    classification TEXT,
+    ground_truth TEXT,
+    correct INTEGER,
+    confidence REAL,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_crypto_tax_run ON crypto_tax_predictions(run_id);
+"""
+
+_FILENAME_TIMESTAMP = re.compile(r"(\d{8})_(\d{6})")
+
+
+def connect(db_path=DEFAULT_DB):
+    """Open (and if needed create) the results index database."""
+    os.makedirs(os.path.dirname(str(db_path)) or ".", exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def detect_kind(path):
+    """Result kind for a file name, or None if it is not a recognised result file."""
+    name = os.path.basename(path)
+    for pattern, kind in KIND_PATTERNS:
+        if fnmatch.fnmatch(name, pattern):
+            return kind
+    return None
+
+
+def flatten_numeric(data, prefix=""):
+    """Yield (dotted_name, value) for every numeric scalar; lists are skipped."""
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten_numeric(value, name + ".")
+        elif isinstance(value, bool):
+            yield name, int(value)
+        elif isinstance(value, int | float):
+            yield name, value
+
+
+def _run_timestamp(data, path, mtime_ns):
+    if isinstance(data, dict) and isinstance(data.get("timestamp"), str):
+        return data["timestamp"].rstrip("Z")
+
+    match = _FILENAME_TIMESTAMP.search(os.path.basename(path))
+    if match:
+        return datetime.strptime("".join(match.groups()), "%Y%m%d%H%M%S").isoformat()
+
+    return datetime.fromtimestamp(mtime_ns / 1e9).isoformat()
+
+
+def _test_name(kind, data):
+    if isinstance(data, dict):
+        for key in ("test_name", "benchmark", "benchmark_name", "experiment"):
+            if isinstance(data.get(key), str):
+                return data[key]
+    return {
+        "emobench_m": "EmoBench-M",
+        "emotion_tracker": "emotion_reasoning_state_tracker",
+    }.get(kind, kind)
+
+
+def _run_metrics(kind, data):
+    """Run-level numeric metrics for a parsed result file."""
+    if kind == "emobench_m":
+        # List of tasks; expose each task's scores under its name
+        metrics = []
+        for task in data:
+            name = task.get("name", "task")
+            for metric, value in flatten_numeric({k: v for k, v in task.items() if k != "name"}):
+                metrics.append((f"{name}.{metric}", value))
+        return metrics
+
+    if kind == "cognitive_integrity":
+        return list(flatten_numeric(data.get("results", {})))
+
+    return list(flatten_numeric(data))
+
+
+def _insert_details(conn, run_id, kind, data):
+    if kind == "copa":
+        conn.executemany(
+            "INSERT INTO copa_samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    r.get("sample_id"),
+                    r.get("question_type"),
+                    r.get("category"),
+                    r.get("correct_label"),
+                    r.get("predicted_label"),
+                    int(bool(r.get("correct"))),
+                    r.get("confidence"),
+                )
+                for r in data.get("results", [])
+            ],
+        )
+
+    elif kind == "emobench_m":
+        conn.executemany(
+            "INSERT INTO emobench_tasks VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    t.get("name"),
+                    t.get("total"),
+                    t.get("correct"),
+                    t.get("accuracy"),
+                    t.get("metrics", {}).get("hazard_score"),
+                    t.get("metrics", {}).get("attention_scale"),
+                )
+                for t in data
+            ],
+        )
+
+    elif kind == "emotion_tracker":
+        rows = []
+        for t in data.get("trials", []):
+            homeostasis = t.get("homeostasis") or {}
+            metacognition = t.get("metacognition") or {}
+            rows.append(
+                (
+                    run_id,
+                    t.get("trial_index"),
+                    t.get("perturbation"),
+                    t.get("emotional_stability"),
+                    t.get("coherence"),
+                    t.get("mmlu_accuracy"),
+                    homeostasis.get("phi_max"),
+                    homeostasis.get("phi_final"),
+                    homeostasis.get("delta_ccs"),
+                    homeostasis.get("epci"),
+                    homeostasis.get("n_interventions"),
+                    metacognition.get("metacognitive_confidence"),
+                )
+            )
+        conn.executemany(
+            "INSERT INTO tracker_trials VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+
+    elif kind == "crypto_tax":
+        ground_truth = data.get("ground_truth", {})
+        conn.executemany(
+            "INSERT INTO crypto_tax_predictions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    r.get("transaction_id"),
+                    r.get("classification"),
+                    ground_truth.get(r.get("transaction_id")),
+                    int(ground_truth.get(r.get("transaction_id")) == r.get("classification")),
+                    r.get("confidence"),
+                    r.get("timestamp"),
+                )
+                for r in data.get("results", [])
+            ],
+        )
+
+
+def ingest_file(conn, path, kind=None):
+    """Ingest one result file if it is new or modified.
+
+    Returns:
+        "new", "updated" or "unchanged".
+    """
+    path = str(Path(path).resolve())
+    kind = kind or detect_kind(path)
+    if kind is None:
+        raise ValueError(f"Unrecognised result file: {path}")
+
+    stat = os.stat(path)
+    existing = conn.execute(
+        "SELECT id, mtime_ns, size FROM runs WHERE path = ?", (path,)
+    ).fetchone()
+
+    if existing and existing[1] == stat.st_mtime_ns and existing[2] == stat.st_size:
+        return "unchanged"
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    run_timestamp = _run_timestamp(data, path, stat.st_mtime_ns)
+    test_name = _test_name(kind, data)
+
+    with conn:
+        if existing:
+            # Cascades to metrics and the per-kind detail tables
+            conn.execute("DELETE FROM runs WHERE id = ?", (existing[0],))
+
+        cursor = conn.execute(
+            "INSERT INTO runs (path, kind, test_name, run_timestamp, mtime_ns, size, ingested_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                kind,
+                test_name,
+                run_timestamp,
+                stat.st_mtime_ns,
+                stat.st_size,
+                datetime.now().isoformat(),
+            ),
+        )
+        run_id = cursor.lastrowid
+
+        conn.executemany(
+            "INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, kind, test_name, run_timestamp, metric, value)
+                for metric, value in _run_metrics(kind, data)
+            ],
+        )
+        _insert_details(conn, run_id, kind, data)
+
+    return "updated" if existing else "new"
+
+
+def ingest(conn, sources=None, root=REPO_ROOT, prune=False):
+    """Ingest every recognised result file matching the source globs.
+
+    Args:
+        conn: Connection from connect().
+        sources: Glob patterns, relative to root unless absolute.
+        root: Base directory for relative patterns.
+        prune: Remove runs whose files no longer exist.
+
+    Returns:
+        Dict counting new/updated/unchanged/skipped/pruned files.
+    """
+    counts = {"new": 0, "updated": 0, "unchanged": 0, "skipped": 0, "pruned": 0}
+
+    paths = set()
+    for pattern in sources or DEFAULT_SOURCES:
+        full_pattern = pattern if os.path.isabs(pattern) else os.path.join(str(root), pattern)
+        paths.update(glob.glob(full_pattern, recursive=True))
+
+    for path in sorted(paths):
+        kind = detect_kind(path)
+        if kind is None:
+            counts["skipped"] += 1
+            continue
+        counts[ingest_file(conn, path, kind)] += 1
+
+    if prune:
+        stale = [(run_id,) for run_id, path in conn.execute("SELECT id, path FROM runs") if not os.path.exists(path)]
+        with conn:
+            conn.executemany("DELETE FROM runs WHERE id = ?", stale)
+        counts["pruned"] = len(stale)
+
+    return counts
+
+
+def metric_history(conn, metric, last=None, test_name=None, kind=None):
+    """Return (run_timestamp, test_name, value, path) rows for a metric, newest first."""
+    sql = (
+        "SELECT m.run_timestamp, m.test_name, m.value, r.path "
+        "FROM metrics m JOIN runs r ON r.id = m.run_id WHERE m.metric = ?"
+    )
+    params = [metric]
+
+    if test_name:
+        sql += " AND m.test_name = ?"
+        params.append(test_name)
+    if kind:
+        sql += " AND m.kind = ?"
+        params.append(kind)
+
+    sql += " ORDER BY m.run_timestamp DESC"
+    if last:
+        sql += " LIMIT ?"
+        params.append(last)
+
+    return conn.execute(sql, params).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=str(DEFAULT_DB))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Ingest new or modified result files")
+    ingest_parser.add_argument("sources", nargs="*", help="Glob patterns (default: known result locations)")
+    ingest_parser.add_argument("--prune", action="store_true", help="Drop runs whose files were deleted")
+
+    metric_parser = subparsers.add_parser("metric", help="Show a metric across runs, newest first")
+    metric_parser.add_argument("metric")
+    metric_parser.add_argument("--last", type=int)
+    metric_parser.add_argument("--test-name")
+    metric_parser.add_argument("--kind")
+
+    query_parser = subparsers.add_parser("query", help="Run an arbitrary SQL query")
+    query_parser.add_argument("sql")
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+
+    if args.command == "ingest":
+        counts = ingest(conn, sources=args.sources or None, root=os.getcwd() if args.sources else REPO_ROOT, prune=args.prune)
+        print(f"✅ Results index updated: {args.db}")
+        print("   " + ", ".join(f"{key}={value}" for key, value in counts.items()))
+
+    elif args.command == "metric":
+        rows = metric_history(conn, args.metric, last=args.last, test_name=args.test_name, kind=args.kind)
+        for run_timestamp, test_name, value, path in rows:
+            print(f"{run_timestamp}  {test_name:<40} {value:>14.6g}  {os.path.basename(path)}")
+        print(f"({len(rows)} runs)")
+
+    else:
+        cursor = conn.execute(args.sql)
+        if cursor.description:
+            print("\t".join(column[0] for column in cursor.description))
+            for row in cursor:
+                print("\t".join(str(value) for value in row))
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
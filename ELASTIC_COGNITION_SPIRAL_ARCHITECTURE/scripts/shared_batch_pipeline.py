@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Emotional Sample Pipeline
+
+Producer/consumer pipeline for feeding generated SEC-labelled samples to
+evaluator processes without pickling them. The producer samples rows with
+sample_emotional_reasoning_rows(), packs each batch into the columnar
+CompactEmotionalDataset layout (SEC vectors, intensities, label and text ids)
+and writes it into a slot of a ring buffer backed by
+multiprocessing.shared_memory. Only (slot, sequence, n_rows) tuples travel
+over the metadata queues; evaluators wrap the slot in NumPy views and run on
+the data in place, then hand the slot back to the producer.
+
+Usage:
+    python shared_batch_pipeline.py --n-samples 200000 --workers 4
+    python shared_batch_pipeline.py --n-samples 200000 --compare
+"""
+
+import argparse
+import itertools
+import multiprocessing as mp
+import random
+import time
+import traceback
+from multiprocessing import shared_memory
+from queue import Empty
+
+import numpy as np
+
+from compact_emotional_dataset import CompactEmotionalDataset, EmotionalTextVocabulary
+from generate_strength_datasets import sample_emotional_reasoning_rows
+
+# Per-row columns of a slot, float columns first so every array stays aligned
+COLUMNS = [
+    ("intensity_primary", np.float64),
+    ("intensity_secondary", np.float64),
+    ("template_id", np.uint8),
+    ("word_id", np.uint8),
+    ("phrase_id", np.uint8),
+    ("suffix_id", np.uint8),
+    ("secondary_id", np.int8),
+]
+
+
+class SharedRingBuffer:
+    """Fixed-size batch slots laid out in one shared memory block.
+
+    The creating process owns the block and must call unlink(); other
+    processes attach by name with create=False.
+    """
+
+    def __init__(self, n_slots, batch_size, n_sec_keys, name=None, create=True):
+        self.n_slots = n_slots
+        self.batch_size = batch_size
+        self.n_sec_keys = n_sec_keys
+
+        self._layout = []
+        offset = 0
+        sec_bytes = batch_size * n_sec_keys * np.dtype(np.float64).itemsize
+        self._layout.append(("sec_vector", np.float64, (batch_size, n_sec_keys), offset))
+        offset += sec_bytes
+        for column, dtype in COLUMNS:
+            self._layout.append((column, dtype, (batch_size,), offset))
+            offset += batch_size * np.dtype(dtype).itemsize
+        # Round slots up to 64 bytes so each starts on its own cache line
+        self.slot_bytes = (offset + 63) // 64 * 64
+
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=n_slots * self.slot_bytes)
+        self.slots = [self._slot_views(i) for i in range(n_slots)]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _slot_views(self, slot):
+        base = slot * self.slot_bytes
+        return {
+            column: np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=base + offset)
+            for column, dtype, shape, offset in self._layout
+        }
+
+    def write(self, slot, batch):
+        """Copy a CompactEmotionalDataset batch into a slot; return its row count."""
+        n = len(batch)
+        if n > self.batch_size:
+            raise ValueError(f"Batch of {n} rows exceeds slot capacity {self.batch_size}")
+        views = self.slots[slot]
+        views["sec_vector"][:n] = batch.sec_vector
+        for column, _ in COLUMNS:
+            views[column][:n] = getattr(batch, column)
+        return n
+
+    def read(self, slot, n_rows, vocab=None):
+        """Zero-copy CompactEmotionalDataset over the first n_rows of a slot."""
+        views = self.slots[slot]
+        return CompactEmotionalDataset(
+            views["template_id"][:n_rows],
+            views["word_id"][:n_rows],
+            views["phrase_id"][:n_rows],
+            views["suffix_id"][:n_rows],
+            views["secondary_id"][:n_rows],
+            views["intensity_primary"][:n_rows],
+            views["intensity_secondary"][:n_rows],
+            views["sec_vector"][:n_rows],
+            vocab=vocab,
+        )
+
+    def close(self):
+        # Views hold exports of the buffer and must go before the mapping does
+        self.slots = []
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def iter_sample_batches(n_samples, batch_size, vocab=None):
+    """Yield CompactEmotionalDataset batches of freshly sampled rows."""
+    vocab = vocab or EmotionalTextVocabulary.default()
+    rows = sample_emotional_reasoning_rows(n_samples)
+    while True:
+        chunk = list(itertools.islice(rows, batch_size))
+        if not chunk:
+            return
+        yield CompactEmotionalDataset.from_samples(chunk, vocab=vocab)
+
+
+def sec_summary_evaluator(batch):
+    """Per-emotion counts and SEC vector sums for one batch.
+
+    Returns a small dict of arrays that merge by addition.
+    """
+    n_emotions = len(batch.vocab.emotion_names)
+    present = ~np.isnan(batch.sec_vector)
+    return {
+        "rows": np.array([len(batch)]),
+        "primary_counts": np.bincount(batch.primary_id, minlength=n_emotions),
+        "mixed": np.array([int((batch.secondary_id >= 0).sum())]),
+        "intensity_primary_sum": np.array([batch.intensity_primary.sum()]),
+        "sec_sum": np.where(present, batch.sec_vector, 0.0).sum(axis=0),
+        "sec_count": present.sum(axis=0),
+    }
+
+
+def merge_results(results):
+    """Add up evaluator results field by field."""
+    merged = {}
+    for result in results:
+        for key, value in result.items():
+            merged[key] = merged[key] + value if key in merged else value
+    return merged
+
+
+# How often blocked queue reads wake up to check that the workers are alive
+_POLL_INTERVAL = 1.0
+
+
+def _evaluate(evaluator, batch, sequence):
+    """(sequence, ok, result or error) message for the results queue.
+
+    Failures are sent as a RuntimeError carrying the formatted traceback,
+    which always pickles, unlike arbitrary evaluator exceptions.
+    """
+    try:
+        return sequence, True, evaluator(batch)
+    except Exception:
+        return sequence, False, RuntimeError(f"Evaluator failed on batch {sequence}:\n{traceback.format_exc()}")
+
+
+def _get(queue, processes):
+    """Blocking queue read that raises instead of hanging once a worker has died."""
+    while True:
+        try:
+            return queue.get(timeout=_POLL_INTERVAL)
+        except Empty:
+            dead = [p for p in processes if p.exitcode not in (None, 0)]
+            if dead:
+                raise RuntimeError(
+                    f"Evaluator process {dead[0].pid} exited with code {dead[0].exitcode}"
+                ) from None
+            if not any(p.is_alive() for p in processes):
+                raise RuntimeError("All evaluator processes exited before finishing") from None
+
+
+def _stop_workers(processes, outbound):
+    """Terminate workers still running after a failure.
+
+    Messages left in the outbound queue will never be read; without
+    cancel_join_thread() its feeder thread would block interpreter exit
+    trying to flush them into the pipe.
+    """
+    alive = [process for process in processes if process.is_alive()]
+    if alive:
+        outbound.cancel_join_thread()
+    for process in alive:
+        process.terminate()
+
+
+def _collect(message, collected):
+    sequence, ok, payload = message
+    if not ok:
+        raise payload
+    collected[sequence] = payload
+
+
+def _evaluator_worker(ring_args, vocab_json, evaluator, ready, free, results):
+    ring = SharedRingBuffer(*ring_args, create=False)
+    vocab = EmotionalTextVocabulary.from_json(vocab_json)
+    try:
+        while True:
+            message = ready.get()
+            if message is None:
+                break
+            slot, sequence, n_rows = message
+            try:
+                results.put(_evaluate(evaluator, ring.read(slot, n_rows, vocab=vocab), sequence))
+            finally:
+                # The slot goes back even if the evaluator failed, so the
+                # producer never waits on it forever
+                free.put(slot)
+    finally:
+        ring.close()
+
+
+def run_pipeline(
+    n_samples=100000,
+    batch_size=4096,
+    n_slots=8,
+    workers=2,
+    evaluator=sec_summary_evaluator,
+    seed=42,
+):
+    """Generate n_samples rows and evaluate them across worker processes.
+
+    The evaluator receives a CompactEmotionalDataset viewing shared memory
+    and must return data rather than views into it, since the slot is reused
+    as soon as the evaluator returns. Returns the results in batch order.
+
+    Raises:
+        RuntimeError: If the evaluator raises (with the worker traceback) or
+            an evaluator process dies.
+    """
+    random.seed(seed)
+    vocab = EmotionalTextVocabulary.default()
+    ring = SharedRingBuffer(n_slots, batch_size, len(vocab.sec_keys))
+    ring_args = (n_slots, batch_size, len(vocab.sec_keys), ring.name)
+
+    ready, free, results = mp.Queue(), mp.Queue(), mp.Queue()
+    for slot in range(n_slots):
+        free.put(slot)
+
+    processes = [
+        mp.Process(
+            target=_evaluator_worker,
+            args=(ring_args, vocab.to_json(), evaluator, ready, free, results),
+            daemon=True,
+        )
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            process.start()
+
+        collected = {}
+        n_batches = 0
+        for sequence, batch in enumerate(iter_sample_batches(n_samples, batch_size, vocab)):
+            slot = _get(free, processes)
+            ready.put((slot, sequence, ring.write(slot, batch)))
+            n_batches += 1
+
+            # Surface evaluator failures while still producing
+            while True:
+                try:
+                    _collect(results.get_nowait(), collected)
+                except Empty:
+                    break
+
+        for _ in processes:
+            ready.put(None)
+
+        while len(collected) < n_batches:
+            _collect(_get(results, processes), collected)
+        for process in processes:
+            process.join()
+        return [collected[sequence] for sequence in range(n_batches)]
+    finally:
+        _stop_workers(processes, ready)
+        ring.close()
+        ring.unlink()
+
+
+def _pickled_worker(vocab_json, evaluator, tasks, results):
+    vocab = EmotionalTextVocabulary.from_json(vocab_json)
+    while True:
+        message = tasks.get()
+        if message is None:
+            break
+        sequence, rows = message
+        results.put(_evaluate(evaluator, CompactEmotionalDataset.from_samples(rows, vocab=vocab), sequence))
+
+
+def run_pickled_pipeline(n_samples=100000, batch_size=4096, workers=2, evaluator=sec_summary_evaluator, seed=42):
+    """Baseline that ships sampled row dicts to workers through a queue."""
+    random.seed(seed)
+    vocab = EmotionalTextVocabulary.default()
+    tasks, results = mp.Queue(maxsize=2 * workers), mp.Queue()
+    processes = [
+        mp.Process(target=_pickled_worker, args=(vocab.to_json(), evaluator, tasks, results), daemon=True)
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            process.start()
+
+        collected = {}
+        rows = sample_emotional_reasoning_rows(n_samples)
+        n_batches = 0
+        while True:
+            chunk = list(itertools.islice(rows, batch_size))
+            if not chunk:
+                break
+            tasks.put((n_batches, chunk))
+            n_batches += 1
+
+        for _ in processes:
+            tasks.put(None)
+        while len(collected) < n_batches:
+            _collect(_get(results, processes), collected)
+        for process in processes:
+            process.join()
+        return [collected[sequence] for sequence in range(n_batches)]
+    finally:
+        _stop_workers(processes, tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n-samples", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compare", action="store_true", help="Also run the pickling baseline")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = merge_results(
+        run_pipeline(args.n_samples, args.batch_size, args.slots, args.workers, seed=args.seed)
+    )
+    elapsed = time.perf_counter() - start
+
+    vocab = EmotionalTextVocabulary.default()
+    print(f"✅ Evaluated {int(summary['rows'][0])} samples in {elapsed:.2f}s "
+          f"({args.n_samples / elapsed:,.0f} samples/s) via shared memory")
+    print(f"   Mixed emotions: {int(summary['mixed'][0])}")
+    print(f"   Primary emotions: {dict(zip(vocab.emotion_names, summary['primary_counts'].tolist(), strict=False))}")
+
+    if args.compare:
+        start = time.perf_counter()
+        baseline = merge_results(
+            run_pickled_pipeline(args.n_samples, args.batch_size, args.workers, seed=args.seed)
+        )
+        baseline_elapsed = time.perf_counter() - start
+        matches = all(np.array_equal(summary[key], baseline[key]) for key in summary)
+        print(f"   Pickled baseline: {baseline_elapsed:.2f}s "
+              f"({args.n_samples / baseline_elapsed:,.0f} samples/s), results {'match' if matches else 'DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+SpiralBrain Publication Tooling CLI
+
+Single entry point for the figure, dataset and publication package scripts.
+Each subcommand imports only the modules (and plotting/dataframe backends) it
+needs, so `--help` or a JSON-only dataset run starts without loading
+matplotlib, seaborn, pandas or numpy (generate_publication_figures loads its
+backends inside the figure functions, so its FIGURES registry is cheap to read).
+
+Usage:
+    python spiralbrain_cli.py figures [--only spiral radar] [--output-dir DIR]
+    python spiralbrain_cli.py datasets emotional [--n-samples 500] [--output FILE]
+    python spiralbrain_cli.py datasets finance [--n-samples 1000] [--output FILE]
+    python spiralbrain_cli.py package [--project-root DIR]
+
+Every subcommand accepts --profile / --trace-memory (see profiling.py).
+"""
+
+import argparse
+import sys
+
+from profiling import StageProfiler, add_profiling_arguments
+
+
+def run_figures(args):
+    import generate_publication_figures as figures
+
+    profiler = StageProfiler.from_args(args, prefix="figures")
+    figures.main(figures_dir=args.output_dir, only=args.only, profiler=profiler)
+
+
+def run_datasets(args):
+    # Imported here so pandas is only loaded by the finance generator itself
+    import generate_strength_datasets as datasets
+
+    profiler = StageProfiler.from_args(args, prefix="datasets")
+    kwargs = {}
+    if args.n_samples is not None:
+        kwargs["n_samples"] = args.n_samples
+
+    if args.kind in ("finance", "all"):
+        finance_kwargs = dict(kwargs)
+        if args.output and args.kind == "finance":
+            finance_kwargs["output_file"] = args.output
+        with profiler.stage("generate_multimodal_finance_dataset"):
+            datasets.generate_multimodal_finance_dataset(**finance_kwargs)
+
+    if args.kind in ("emotional", "all"):
+        emotional_kwargs = dict(kwargs)
+        if args.output and args.kind == "emotional":
+            emotional_kwargs["output_file"] = args.output
+        with profiler.stage("generate_emotional_reasoning_dataset"):
+            datasets.generate_emotional_reasoning_dataset(**emotional_kwargs)
+
+    profiler.finish()
+
+
+def run_package(args):
+    from create_publication_package import PublicationPackager
+
+    profiler = StageProfiler.from_args(args, prefix="package")
+    PublicationPackager(args.project_root).generate_package(profiler=profiler)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="SpiralBrain publication tooling")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Importing the module runs no plotting code; its backends load per figure
+    from generate_publication_figures import FIGURES
+
+    figures_parser = subparsers.add_parser("figures", help="Generate publication figures")
+    figures_parser.add_argument("--output-dir", default="publication_package/figures")
+    figures_parser.add_argument("--only", nargs="+", choices=list(FIGURES), help="Generate only these figures")
+    add_profiling_arguments(figures_parser)
+    figures_parser.set_defaults(func=run_figures)
+
+    datasets_parser = subparsers.add_parser("datasets", help="Generate strength-test datasets")
+    datasets_parser.add_argument("kind", choices=["finance", "emotional", "all"])
+    datasets_parser.add_argument("--n-samples", type=int)
+    datasets_parser.add_argument("--output", help="Output file (single dataset kinds only)")
+    add_profiling_arguments(datasets_parser)
+    datasets_parser.set_defaults(func=run_datasets)
+
+    package_parser = subparsers.add_parser("package", help="Build the publication package")
+    package_parser.add_argument("--project-root", default=".")
+    add_profiling_arguments(package_parser)
+    package_parser.set_defaults(func=run_package)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Streaming Stratified Subset Sampler
+
+Builds evaluation subsets (like ARTICLE_EMOTION_CONTROL/data/
+emotional_intervention_subset.yaml) from intervention logs and generated
+datasets in a single pass. Records are grouped into strata by one or more
+fields, e.g. emotion_label, risk_category, or effectiveness_score in buckets
+of 0.25, and each stratum keeps a reservoir sample (Algorithm L), so memory
+is the per-stratum capacity times the number of strata rather than the size
+of the input. With --size alone every stratum reserves --size records, so
+pass --per-stratum as well to cap memory when there are many strata.
+
+Each stratum draws from its own RNG seeded from --seed and the stratum key,
+so a stratum's sample depends only on its own records and is reproducible.
+
+Inputs: .jsonl, .json (top-level array, parsed incrementally), .csv, and
+.yaml/.yml (a top-level sequence, or a document's "interventions" sequence,
+is streamed one item at a time). Output format follows the output file
+extension.
+
+Usage:
+    python stratified_sampler.py logs/*.yaml --stratify effectiveness_score:0.25 --size 40 --output subset.yaml
+    python stratified_sampler.py data/emotional_reasoning.json --stratify emotion_label --per-stratum 5 --output subset.jsonl
+    python stratified_sampler.py data/multimodal_finance.csv --stratify risk_category --size 100 --output subset.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import zlib
+from pathlib import Path
+
+import yaml
+
+
+class Reservoir:
+    """Uniform sample of up to k items from a stream (Li's Algorithm L).
+
+    Once the reservoir is full, the number of items to skip before the next
+    replacement is drawn directly, so most items cost no RNG calls.
+    """
+
+    def __init__(self, k, rng):
+        self.k = k
+        self.rng = rng
+        self.items = []
+        self.seen = 0
+        self._w = 1.0
+        # Stream position of the next item to enter the reservoir
+        self._next = k - 1
+
+    def _advance(self):
+        # 1 - random() lies in (0, 1], keeping the logs finite
+        self._w *= math.exp(math.log(1.0 - self.rng.random()) / self.k)
+        self._next += math.floor(math.log(1.0 - self.rng.random()) / math.log1p(-self._w)) + 1
+
+    def add(self, item):
+        if self.k <= 0:
+            self.seen += 1
+            return
+
+        if len(self.items) < self.k:
+            self.items.append(item)
+            if len(self.items) == self.k:
+                self._advance()
+        elif self.seen == self._next:
+            self.items[self.rng.randrange(self.k)] = item
+            self._advance()
+        self.seen += 1
+
+
+def parse_stratum_field(spec):
+    """'field.path' or 'field.path:bucket_width' → (path parts, bucket width or None)."""
+    path, _, width = spec.partition(":")
+    return path.split("."), float(width) if width else None
+
+
+def stratum_key(record, fields):
+    """Tuple of stratum values for a record; numeric fields are bucketed by width."""
+    key = []
+    for path, width in fields:
+        value = record
+        for part in path:
+            value = value.get(part) if isinstance(value, dict) else None
+        if width is not None and value not in (None, ""):
+            # Bucket by lower edge; CSV values arrive as strings
+            value = round(math.floor(float(value) / width) * width, 10)
+        key.append(value)
+    return tuple(key)
+
+
+def _stratum_seed(seed, key):
+    return zlib.crc32(repr(key).encode("utf-8"), seed & 0xFFFFFFFF)
+
+
+class StratifiedSampler:
+    """Per-stratum reservoirs over a single pass of records."""
+
+    def __init__(self, fields, capacity, seed=42):
+        self.fields = [parse_stratum_field(f) if isinstance(f, str) else f for f in fields]
+        self.capacity = capacity
+        self.seed = seed
+        self.reservoirs = {}
+        self.n_records = 0
+
+    def add(self, record):
+        key = stratum_key(record, self.fields)
+        reservoir = self.reservoirs.get(key)
+        if reservoir is None:
+            reservoir = self.reservoirs[key] = Reservoir(
+                self.capacity, random.Random(_stratum_seed(self.seed, key))
+            )
+        # Keep the input position so the subset can be emitted in stream order
+        reservoir.add((self.n_records, record))
+        self.n_records += 1
+
+    def add_all(self, records):
+        for record in records:
+            self.add(record)
+        return self
+
+    def allocate(self, size, allocation="proportional"):
+        """Split a total sample size across strata.
+
+        proportional: by stratum size (largest remainder). equal: the same
+        share per stratum, with unused share from small strata handed on to
+        larger ones.
+        """
+        available = {key: len(r.items) for key, r in self.reservoirs.items()}
+        size = min(size, sum(available.values()))
+        keys = sorted(available, key=repr)
+
+        if allocation == "proportional":
+            total = sum(r.seen for r in self.reservoirs.values())
+            quotas = {key: size * self.reservoirs[key].seen / total for key in keys}
+            counts = {key: min(int(quotas[key]), available[key]) for key in keys}
+            by_remainder = sorted(keys, key=lambda k: (-(quotas[k] - int(quotas[k])), repr(k)))
+        else:
+            counts = {key: 0 for key in keys}
+            by_remainder = keys
+
+        # Hand out what is left one at a time, skipping exhausted strata
+        remaining = size - sum(counts.values())
+        while remaining > 0:
+            for key in by_remainder:
+                if remaining and counts[key] < available[key]:
+                    counts[key] += 1
+                    remaining -= 1
+        return counts
+
+    def sample(self, size=None, allocation="proportional"):
+        """Sampled records in input order.
+
+        Without size, every reservoir is returned whole (capacity per
+        stratum); with size, each reservoir is subsampled to its allocation.
+        """
+        if size is None:
+            counts = {key: len(r.items) for key, r in self.reservoirs.items()}
+        else:
+            counts = self.allocate(size, allocation)
+
+        selected = []
+        for key, reservoir in self.reservoirs.items():
+            items = reservoir.items
+            if counts[key] < len(items):
+                # A uniform subsample of a uniform reservoir is still uniform
+                items = reservoir.rng.sample(items, counts[key])
+            selected.extend(items)
+
+        selected.sort(key=lambda item: item[0])
+        return [record for _, record in selected]
+
+    def stratum_counts(self):
+        return {key: r.seen for key, r in self.reservoirs.items()}
+
+
+def _iter_json_array(f, chunk_size=1 << 16):
+    """Yield the elements of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+
+    while True:
+        # Skip whitespace and separators between elements
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if not started and position < len(buffer):
+            if buffer[position] != "[":
+                raise ValueError("Expected a top-level JSON array")
+            started = True
+            position += 1
+            continue
+        if started and position < len(buffer) and buffer[position] == "]":
+            return
+
+        # Only decode when the element is followed by more text, so numbers
+        # split across chunk boundaries are never parsed short
+        if position < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                end = None
+            if end is not None and (end < len(buffer) or eof):
+                yield value
+                position = end
+                continue
+
+        if eof:
+            if started:
+                raise ValueError("Unterminated JSON array")
+            return
+
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def _iter_yaml_items(loader):
+    """Construct the items of the sequence that starts at the next event, one at a time."""
+    loader.get_event()
+    while not loader.check_event(yaml.SequenceEndEvent):
+        yield loader.construct_document(loader.compose_node(None, None))
+    loader.get_event()
+
+
+def _iter_yaml_document(loader):
+    if loader.check_event(yaml.SequenceStartEvent):
+        yield from _iter_yaml_items(loader)
+        return
+    if not loader.check_event(yaml.MappingStartEvent):
+        document = loader.construct_document(loader.compose_node(None, None))
+        if document is not None:
+            yield document
+        return
+
+    # Walk the top-level mapping by hand so "interventions" is never built whole
+    loader.get_event()
+    document = {}
+    streamed = False
+    while not loader.check_event(yaml.MappingEndEvent):
+        key = loader.construct_document(loader.compose_node(None, None))
+        if key == "interventions" and loader.check_event(yaml.SequenceStartEvent):
+            streamed = True
+            yield from _iter_yaml_items(loader)
+        else:
+            document[key] = loader.construct_document(loader.compose_node(None, None))
+    loader.get_event()
+    if not streamed:
+        yield document
+
+
+def _iter_yaml_records(f):
+    """Stream YAML records with the safe loader, composing one record node at a time.
+
+    Only anchored nodes are kept beyond their record, so that later aliases
+    to them still resolve.
+    """
+    loader = yaml.SafeLoader(f)
+    try:
+        loader.get_event()
+        while not loader.check_event(yaml.StreamEndEvent):
+            loader.get_event()
+            yield from _iter_yaml_document(loader)
+            loader.get_event()
+            # Anchors are scoped to their document
+            loader.anchors = {}
+    finally:
+        loader.dispose()
+
+
+def iter_records(path):
+    """Stream records from a JSONL, JSON array, CSV or YAML file."""
+    suffix = Path(path).suffix.lower()
+    with open(path, encoding="utf-8", newline="" if suffix == ".csv" else None) as f:
+        if suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif suffix == ".json":
+            yield from _iter_json_array(f)
+        elif suffix == ".csv":
+            yield from csv.DictReader(f)
+        elif suffix in (".yaml", ".yml"):
+            yield from _iter_yaml_records(f)
+        else:
+            raise ValueError(f"Unsupported input format: {path}")
+
+
+def write_records(records, path, notes=None):
+    """Write records in the format implied by the file extension."""
+    suffix = Path(path).suffix.lower()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "w", encoding="utf-8", newline="" if suffix == ".csv" else None) as f:
+        if suffix == ".jsonl":
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        elif suffix == ".json":
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        elif suffix == ".csv":
+            fieldnames = list(dict.fromkeys(key for record in records for key in record))
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(records)
+        elif suffix in (".yaml", ".yml"):
+            document = {"interventions": records}
+            if notes:
+                document["notes"] = notes
+            yaml.safe_dump(document, f, allow_unicode=True)
+        else:
+            raise ValueError(f"Unsupported output format: {path}")
+
+
+def sample_files(paths, fields, size=None, per_stratum=None, allocation="proportional", seed=42):
+    """Stratified sample across input files; returns (records, sampler).
+
+    With size and no per_stratum, each stratum reserves up to size records so
+    any allocation can be met.
+    """
+    sampler = StratifiedSampler(fields, per_stratum or size, seed=seed)
+    for path in paths:
+        sampler.add_all(iter_records(path))
+    return sampler.sample(size, allocation), sampler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="JSONL, JSON, CSV or YAML files")
+    parser.add_argument("--output", required=True, help="Output file (.jsonl, .json, .csv or .yaml)")
+    parser.add_argument(
+        "--stratify",
+        nargs="+",
+        required=True,
+        help="Stratum fields, dotted for nested keys, with :width to bucket numbers",
+    )
+    parser.add_argument("--size", type=int, help="Total subset size")
+    parser.add_argument("--per-stratum", type=int, help="Records kept per stratum")
+    parser.add_argument("--allocation", choices=["proportional", "equal"], default="proportional")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not args.size and not args.per_stratum:
+        parser.error("pass --size and/or --per-stratum")
+
+    records, sampler = sample_files(
+        args.inputs, args.stratify, args.size, args.per_stratum, args.allocation, args.seed
+    )
+    notes = f"Stratified sample by {', '.join(args.stratify)} (seed {args.seed})"
+    write_records(records, args.output, notes=notes)
+
+    print(f"✅ Sampled {len(records)} of {sampler.n_records} records across {len(sampler.reservoirs)} strata")
+    for key, seen in sorted(sampler.stratum_counts().items(), key=lambda item: repr(item[0])):
+        label = ", ".join(str(value) for value in key)
+        print(f"   {label}: {seen}")
+    print(f"   Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Asynchronous Batched Telemetry Sink
+
+Background-thread writer for brain trace records (brain_trace.jsonl style).
+The hot loop only enqueues the record dict; JSON serialization, batching and
+file I/O happen on a dedicated writer thread that flushes whenever a batch
+fills up or the flush interval elapses.
+
+When the bounded buffer is full the sink either blocks the producer
+(overflow="block") or drops the record and counts it (overflow="drop"), so
+tracing can stay enabled without stalling the cognitive loop.
+"""
+
+import atexit
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+
+class TelemetrySink:
+    """Bounded-buffer JSONL writer that serializes records off the hot path."""
+
+    def __init__(
+        self,
+        path,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        overflow: str = "drop",
+        serializer=None,
+        append: bool = True,
+        binary: bool = False,
+    ):
+        """
+        Args:
+            path: Output file path (parent directories are created).
+            batch_size: Wake the writer once this many records are pending.
+            flush_interval: Flush at least this often (seconds) while records are pending.
+            max_queue: Maximum number of records waiting for the writer thread.
+            overflow: "drop" to discard and count records when the buffer is
+                full, "block" to apply backpressure to the producer.
+            serializer: Callable turning a list of records into the text to
+                append; defaults to one JSON object per line.
+            append: Append to an existing file instead of truncating it.
+            binary: Open the file in binary mode for serializers returning
+                bytes (e.g. trace_codec.TraceEncoder.serialize_batch).
+        """
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"overflow must be 'drop' or 'block', got {overflow!r}")
+
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.serializer = serializer or self._serialize_jsonl
+
+        self.written = 0
+        self.dropped = 0
+        # Records lost because their batch failed to serialize or write
+        self.failed = 0
+        self.batches = 0
+        self.error = None
+
+        # deque.append/popleft are atomic, so the hot path takes no lock
+        self._buffer = deque()
+        self._wakeup = threading.Event()
+        self._space = threading.Event()
+        self._space.set()
+        self._flush_requests = []
+        self._flush_lock = threading.Lock()
+        self._closed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        mode = "a" if append else "w"
+        if binary:
+            self._file = open(self.path, mode + "b")
+        else:
+            self._file = open(self.path, mode, encoding="utf-8")
+
+        self._thread = threading.Thread(target=self._run, name="telemetry-sink", daemon=True)
+        self._thread.start()
+
+        # Guarantee pending records reach disk at interpreter shutdown
+        atexit.register(self.close)
+
+    @staticmethod
+    def _serialize_jsonl(records):
+        return "".join(json.dumps(record) + "\n" for record in records)
+
+    def emit(self, record):
+        """Queue a record for writing.
+
+        The record is serialized later on the writer thread, so callers must
+        not mutate it after emitting.
+
+        Returns:
+            True if the record was queued, False if it was dropped.
+        """
+        if self._closed:
+            raise RuntimeError("TelemetrySink is closed")
+        self._check_writer()
+
+        buffer = self._buffer
+
+        if len(buffer) >= self.max_queue:
+            if self.overflow == "drop":
+                self.dropped += 1
+                return False
+
+            while len(buffer) >= self.max_queue:
+                self._space.clear()
+                self._wakeup.set()
+                self._space.wait(self.flush_interval)
+                self._check_writer()
+
+        buffer.append(record)
+
+        if len(buffer) >= self.batch_size:
+            self._wakeup.set()
+
+        return True
+
+    def flush(self, timeout=None):
+        """Block until every record emitted so far has been written.
+
+        Returns:
+            True once the records are written, False on timeout, if a batch
+            failed to write in the meantime, or if the writer thread has
+            stopped.
+        """
+        if self._closed:
+            return True
+        if not self._thread.is_alive():
+            return False
+
+        failed_before = self.failed
+        done = threading.Event()
+        with self._flush_lock:
+            self._flush_requests.append(done)
+        self._wakeup.set()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.flush_interval
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    break
+            if done.wait(wait) or not self._thread.is_alive():
+                break
+
+        return done.is_set() and self._thread.is_alive() and self.failed == failed_before
+
+    def close(self):
+        """Drain the buffer, flush the final batch and close the file."""
+        if self._closed:
+            return
+
+        self._closed = True
+        atexit.unregister(self.close)
+
+        self._wakeup.set()
+        self._thread.join()
+        self._file.close()
+
+        # Records left behind by a writer thread that died are lost
+        self.failed += len(self._buffer)
+        self._buffer.clear()
+
+        if self.error is not None:
+            raise self.error
+
+    def stats(self):
+        """Counters describing sink throughput and loss."""
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "failed": self.failed,
+            "pending": len(self._buffer),
+        }
+
+    def _check_writer(self):
+        if not self._thread.is_alive():
+            raise RuntimeError("TelemetrySink writer thread has stopped") from self.error
+
+    def _record_error(self, error):
+        # The first failure is re-raised on close()
+        if self.error is None:
+            self.error = error
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+
+        try:
+            self._file.write(self.serializer(batch))
+            self._file.flush()
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            # Any serializer or I/O failure loses only this batch; the writer
+            # keeps running
+            self.failed += len(batch)
+            self._record_error(e)
+
+    def _drain(self):
+        # Take flush requests before draining so every record emitted ahead
+        # of a flush() call is part of this pass
+        with self._flush_lock:
+            requests, self._flush_requests = self._flush_requests, []
+
+        buffer = self._buffer
+        while buffer:
+            batch = [buffer.popleft() for _ in range(min(len(buffer), self.batch_size))]
+            self._space.set()
+            self._write_batch(batch)
+
+        for done in requests:
+            done.set()
+
+    def _run(self):
+        try:
+            while not self._closed:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                self._drain()
+
+            self._drain()
+        except BaseException as e:
+            self._record_error(e)
+            raise
+        finally:
+            # Never leave producers or flush() callers waiting on a dead writer
+            self._space.set()
+            with self._flush_lock:
+                requests, self._flush_requests = self._flush_requests, []
+            for done in requests:
+                done.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def benchmark_sink(n_ticks=20000, tick_interval=0.0001, path="logs/telemetry_benchmark.jsonl"):
+    """Compare per-tick cost of synchronous writes against the async sink.
+
+    Ticks are paced tick_interval apart, as in a running cognitive loop, and
+    only the write/emit call itself is timed. With overflow="drop" the
+    producer never waits on the writer, so the async figure is the hot-path
+    overhead rather than the writer's throughput.
+    """
+    record = {
+        "t_rel": 0.0,
+        "coherence": 0.7172,
+        "stability": 0.8564,
+        "hazard_pressure": 0.1086,
+        "sec_drift": 0.0863,
+        "meta_awareness": 0.7172,
+    }
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    sync_time = 0.0
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n_ticks):
+            tick = dict(record, t_rel=i * 0.05)
+            start = time.perf_counter()
+            f.write(json.dumps(tick) + "\n")
+            f.flush()
+            sync_time += time.perf_counter() - start
+            time.sleep(tick_interval)
+
+    sink = TelemetrySink(path, append=False, overflow="drop")
+    emit_time = 0.0
+    for i in range(n_ticks):
+        tick = dict(record, t_rel=i * 0.05)
+        start = time.perf_counter()
+        sink.emit(tick)
+        emit_time += time.perf_counter() - start
+        time.sleep(tick_interval)
+    start = time.perf_counter()
+    sink.close()
+    drain_time = time.perf_counter() - start
+
+    print(f"📊 Telemetry sink benchmark ({n_ticks} ticks, {tick_interval * 1e6:.0f} µs apart)")
+    print(f"   Synchronous write: {sync_time / n_ticks * 1e6:.2f} µs/tick")
+    print(f"   Async emit (hot path): {emit_time / n_ticks * 1e6:.2f} µs/tick")
+    print(f"   Drain on close: {drain_time * 1e3:.1f} ms  stats={sink.stats()}")
+
+
+if __name__ == "__main__":
+    benchmark_sink()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Chunk-Compressed Trace Archive
+
+Long-term storage format for brain traces (brain_trace.jsonl) and homeostasis
+logs (homeostasis_cycle.json). Records are grouped into fixed-size chunks that
+are compressed independently with stdlib zlib or lzma, and a chunk index keyed
+by t_rel / cycle number is stored at the end of the file. Readers decompress
+only the chunks covering a requested window, in parallel threads (both codecs
+release the GIL while decompressing).
+
+File layout:
+    MAGIC | chunk 0 | chunk 1 | ... | index JSON | trailer (index offset, MAGIC)
+"""
+
+import argparse
+import bisect
+import json
+import lzma
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from trace_codec import decode_records, encode_records
+
+MAGIC = b"SBTA"
+_TRAILER = struct.Struct("<Q4s")
+
+COMPRESSORS = {
+    "zlib": (lambda data, level: zlib.compress(data, level), zlib.decompress),
+    "lzma": (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+
+# Fields tried, in order, when no explicit index key is given
+DEFAULT_KEY_FIELDS = ["t_rel", "cycle", "timestamp"]
+
+
+def load_trace_records(path):
+    """Load records and session metadata from a JSONL trace or a homeostasis cycle log."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()], {}
+
+        data = json.load(f)
+
+    if isinstance(data, list):
+        return data, {}
+
+    # homeostasis_cycle.json: session fields plus a list of cycles
+    meta = {key: value for key, value in data.items() if key != "cycles"}
+    return data.get("cycles", []), meta
+
+
+def _serialize_chunk(records, encoding):
+    if encoding == "delta":
+        # Each chunk gets its own segment header so it decodes independently
+        return encode_records(records, keyframe_interval=len(records) or 1)
+    return "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+
+
+def _deserialize_chunk(data, encoding):
+    if encoding == "delta":
+        return decode_records(data)
+    return [json.loads(line) for line in data.decode("utf-8").splitlines() if line]
+
+
+def write_archive(
+    records,
+    path,
+    chunk_size=1000,
+    codec="zlib",
+    level=6,
+    key_field=None,
+    encoding="jsonl",
+    meta=None,
+):
+    """Write records to a chunk-compressed archive.
+
+    Args:
+        records: List of record dicts, ordered by key_field.
+        path: Output archive path.
+        chunk_size: Records per independently compressed chunk.
+        codec: "zlib" or "lzma".
+        level: Compression level (zlib level or lzma preset).
+        key_field: Record field used for window lookups; detected from
+            DEFAULT_KEY_FIELDS when omitted, falling back to record position.
+        encoding: "jsonl" for JSON lines or "delta" for trace_codec frames.
+        meta: Optional session metadata stored alongside the index.
+
+    Returns:
+        The archive index dict.
+    """
+    if codec not in COMPRESSORS:
+        raise ValueError(f"Unknown codec {codec!r}; choose from {sorted(COMPRESSORS)}")
+    if encoding not in ("jsonl", "delta"):
+        raise ValueError("encoding must be 'jsonl' or 'delta'")
+
+    if key_field is None and records:
+        key_field = next((f for f in DEFAULT_KEY_FIELDS if f in records[0]), None)
+
+    compress = COMPRESSORS[codec][0]
+    chunks = []
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+
+        for first in range(0, len(records), chunk_size):
+            chunk = records[first : first + chunk_size]
+            keys = [record[key_field] if key_field else first + i for i, record in enumerate(chunk)]
+            payload = compress(_serialize_chunk(chunk, encoding), level)
+
+            chunks.append(
+                {
+                    "offset": f.tell(),
+                    "length": len(payload),
+                    "first_record": first,
+                    "n_records": len(chunk),
+                    "key_min": min(keys),
+                    "key_max": max(keys),
+                }
+            )
+            f.write(payload)
+
+        index = {
+            "version": 1,
+            "codec": codec,
+            "encoding": encoding,
+            "key_field": key_field,
+            "chunk_size": chunk_size,
+            "n_records": len(records),
+            "meta": meta or {},
+            "chunks": chunks,
+        }
+
+        index_offset = f.tell()
+        f.write(json.dumps(index, separators=(",", ":")).encode("utf-8"))
+        f.write(_TRAILER.pack(index_offset, MAGIC))
+
+    return index
+
+
+class TraceArchive:
+    """Random-access reader for chunk-compressed trace archives."""
+
+    def __init__(self, path):
+        self.path = path
+
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a trace archive")
+
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            index_offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} has a corrupt trailer")
+
+            f.seek(index_offset)
+            self.index = json.loads(f.read(os.path.getsize(path) - _TRAILER.size - index_offset))
+
+        self.chunks = self.index["chunks"]
+        self.key_field = self.index["key_field"]
+        self.meta = self.index["meta"]
+        self._decompress = COMPRESSORS[self.index["codec"]][1]
+
+        # Sorted key_max lets monotonic traces locate the first chunk by bisection
+        self._key_max = [chunk["key_max"] for chunk in self.chunks]
+        self._monotonic = all(
+            a["key_max"] <= b["key_min"] for a, b in zip(self.chunks, self.chunks[1:], strict=False)
+        )
+
+    def __len__(self):
+        return self.index["n_records"]
+
+    def coerce_key(self, value):
+        """Convert a window bound (e.g. a CLI string) to the type of the stored keys.
+
+        String keys such as ISO timestamps compare lexicographically; numeric
+        keys (t_rel, cycle, record position) are compared as floats.
+        """
+        if value is None or not self.chunks:
+            return value
+        if isinstance(self.chunks[0]["key_min"], str):
+            return str(value)
+        return float(value)
+
+    def _record_key(self, record, position):
+        return record[self.key_field] if self.key_field else position
+
+    def chunks_for_window(self, start=None, end=None):
+        """Indices of chunks whose key range overlaps [start, end]."""
+        if self._monotonic and start is not None:
+            first = bisect.bisect_left(self._key_max, start)
+        else:
+            first = 0
+
+        selected = []
+        for i in range(first, len(self.chunks)):
+            chunk = self.chunks[i]
+            if end is not None and chunk["key_min"] > end:
+                if self._monotonic:
+                    break
+                continue
+            if start is not None and chunk["key_max"] < start:
+                continue
+            selected.append(i)
+
+        return selected
+
+    def read_chunk(self, chunk_index):
+        """Decompress and decode a single chunk."""
+        chunk = self.chunks[chunk_index]
+
+        # Separate handle per call so chunks can be read from several threads
+        with open(self.path, "rb") as f:
+            f.seek(chunk["offset"])
+            payload = f.read(chunk["length"])
+
+        return _deserialize_chunk(self._decompress(payload), self.index["encoding"])
+
+    def read_window(self, start=None, end=None, workers=4):
+        """Return records whose key lies in [start, end], decompressing only overlapping chunks."""
+        selected = self.chunks_for_window(start, end)
+
+        if workers > 1 and len(selected) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                decoded = list(executor.map(self.read_chunk, selected))
+        else:
+            decoded = [self.read_chunk(i) for i in selected]
+
+        records = []
+        for chunk_index, chunk_records in zip(selected, decoded, strict=False):
+            first = self.chunks[chunk_index]["first_record"]
+            for offset, record in enumerate(chunk_records):
+                key = self._record_key(record, first + offset)
+                if (start is None or key >= start) and (end is None or key <= end):
+                    records.append(record)
+
+        return records
+
+    def read_all(self, workers=4):
+        """Return every record in the archive."""
+        return self.read_window(workers=workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = subparsers.add_parser("pack", help="Archive a JSONL trace or homeostasis log")
+    pack_parser.add_argument("input")
+    pack_parser.add_argument("output")
+    pack_parser.add_argument("--chunk-size", type=int, default=1000)
+    pack_parser.add_argument("--codec", choices=sorted(COMPRESSORS), default="zlib")
+    pack_parser.add_argument("--level", type=int, default=6)
+    pack_parser.add_argument("--key-field")
+    pack_parser.add_argument("--encoding", choices=["jsonl", "delta"], default="jsonl")
+
+    read_parser = subparsers.add_parser("read", help="Extract a key window as JSONL")
+    read_parser.add_argument("archive")
+    read_parser.add_argument("--start", help="Window start, parsed to match the archive key type")
+    read_parser.add_argument("--end", help="Window end, parsed to match the archive key type")
+    read_parser.add_argument("--workers", type=int, default=4)
+    read_parser.add_argument("--output", help="Write JSONL here instead of stdout")
+
+    info_parser = subparsers.add_parser("info", help="Show archive index summary")
+    info_parser.add_argument("archive")
+
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        records, meta = load_trace_records(args.input)
+        index = write_archive(
+            records,
+            args.output,
+            chunk_size=args.chunk_size,
+            codec=args.codec,
+            level=args.level,
+            key_field=args.key_field,
+            encoding=args.encoding,
+            meta=meta,
+        )
+        original = os.path.getsize(args.input)
+        archived = os.path.getsize(args.output)
+        print(f"✅ Archived {index['n_records']} records in {len(index['chunks'])} chunks")
+        print(f"   Size: {original:,} → {archived:,} bytes ({original / max(archived, 1):.1f}x)")
+
+    elif args.command == "read":
+        archive = TraceArchive(args.archive)
+        start, end = archive.coerce_key(args.start), archive.coerce_key(args.end)
+        records = archive.read_window(start, end, workers=args.workers)
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(lines)
+            print(f"✅ Extracted {len(records)} records to: {args.output}")
+        else:
+            print(lines, end="")
+
+    else:
+        archive = TraceArchive(args.archive)
+        index = archive.index
+        print(f"📦 {args.archive}")
+        print(f"   Records: {index['n_records']}  Chunks: {len(index['chunks'])}")
+        print(f"   Codec: {index['codec']}  Encoding: {index['encoding']}  Key: {index['key_field']}")
+        if archive.chunks:
+            print(f"   Key range: {archive.chunks[0]['key_min']} → {archive.chunks[-1]['key_max']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Delta-Encoded Brain Trace Codec
+
+Compact binary encoding for brain_trace.jsonl style records. Every line of a
+plain trace repeats the full active_pathways object even though only the
+pathway weights and a handful of scalars change per tick. This codec:
+
+- writes the record layout and all static fields once per segment,
+- stores numeric leaves (scalars and pathway weights) as packed float arrays,
+- emits only the slots that changed since the previous tick, and
+- writes a full keyframe every N ticks, refreshing every slot value.
+
+Streams are decoded from the start: frames carry no offset index, and the
+segment header is only written when the record layout changes.
+
+Decoding reconstructs the original records exactly (with the default float64
+slots), including key order and ISO timestamp strings.
+
+Frame layout: 1-byte tag, 4-byte little-endian payload length, payload.
+    S  segment header (JSON: template record, slot paths/types, other paths)
+    K  keyframe (all slot values + JSON of all other leaves)
+    D  delta (bitmask of changed slots + their values + JSON of changed other leaves)
+"""
+
+import argparse
+import copy
+import io
+import json
+import math
+import os
+import struct
+from datetime import datetime, timedelta
+
+SEGMENT = b"S"
+KEYFRAME = b"K"
+DELTA = b"D"
+
+_FRAME_HEADER = struct.Struct("<cI")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _timestamp_to_micros(value):
+    """Return microseconds since epoch if value is a naive ISO timestamp that round-trips."""
+    if len(value) < 19 or value[4] != "-" or value[10] != "T":
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is not None or parsed.isoformat() != value:
+        return None
+
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def _micros_to_timestamp(micros):
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+def _flatten(record, prefix=()):
+    """Yield (path, leaf) pairs in key order; lists are treated as leaves."""
+    for key, value in record.items():
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            yield from _flatten(value, path)
+        else:
+            yield path, value
+
+
+def _slot_type(value):
+    """Packed slot type for a leaf: 'd' float, 'q' int, 'T' timestamp, or None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, float):
+        return "d"
+    if isinstance(value, int) and -(2**63) <= value < 2**63:
+        return "q"
+    if isinstance(value, str) and _timestamp_to_micros(value) is not None:
+        return "T"
+    return None
+
+
+def _changed(value, previous):
+    """True unless value and previous would serialize identically.
+
+    Unlike !=, this tells 0.0 from -0.0 and 1 from 1.0 (or True), including
+    inside lists and dicts.
+    """
+    if type(value) is not type(previous) or value != previous:
+        return True
+    if type(value) is float:
+        return math.copysign(1.0, value) != math.copysign(1.0, previous)
+    if type(value) is list:
+        return any(_changed(v, p) for v, p in zip(value, previous, strict=False))
+    if type(value) is dict:
+        return any(_changed(v, previous[k]) for k, v in value.items())
+    return False
+
+
+def _set_path(record, path, value):
+    for key in path[:-1]:
+        record = record[key]
+    record[path[-1]] = value
+
+
+class TraceEncoder:
+    """Stateful delta encoder producing the binary frame stream."""
+
+    def __init__(self, keyframe_interval: int = 100, float_format: str = "d"):
+        """
+        Args:
+            keyframe_interval: Emit a full keyframe every this many records.
+            float_format: "d" for lossless float64 slots, "f" for float32
+                (halves slot size at the cost of ~7 significant digits).
+        """
+        if float_format not in ("d", "f"):
+            raise ValueError("float_format must be 'd' or 'f'")
+
+        self.keyframe_interval = keyframe_interval
+        self.float_format = float_format
+        self._signature = None
+        self._previous = None
+        self._other_previous = None
+        self._since_keyframe = 0
+
+    def _start_segment(self, leaves, signature):
+        slots = [(path, kind) for path, kind in signature if kind]
+        others = [path for path, kind in signature if not kind]
+
+        template = {}
+        for (path, value), (_, kind) in zip(leaves, signature, strict=False):
+            node = template
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = None if kind else value
+
+        self._signature = signature
+        self._slot_kinds = [kind for _, kind in slots]
+        self._pack_kinds = [self.float_format if k == "d" else "q" for k in self._slot_kinds]
+        self._previous = None
+        self._other_previous = None
+        self._since_keyframe = 0
+
+        header = {
+            "template": template,
+            "slots": [[list(path), kind] for path, kind in slots],
+            "others": [list(path) for path in others],
+            "float_format": self.float_format,
+        }
+        return _frame(SEGMENT, json.dumps(header, separators=(",", ":")).encode("utf-8"))
+
+    def encode(self, record):
+        """Encode one record, returning the bytes to append to the stream."""
+        leaves = list(_flatten(record))
+        signature = tuple((path, _slot_type(value)) for path, value in leaves)
+
+        out = b""
+        if signature != self._signature:
+            out += self._start_segment(leaves, signature)
+
+        values = []
+        others = []
+        for (_, value), (_, kind) in zip(leaves, signature, strict=False):
+            if kind == "T":
+                values.append(_timestamp_to_micros(value))
+            elif kind:
+                values.append(value)
+            else:
+                others.append(value)
+
+        if self._previous is None or self._since_keyframe >= self.keyframe_interval:
+            payload = struct.pack("<" + "".join(self._pack_kinds), *values)
+            payload += json.dumps(others, separators=(",", ":")).encode("utf-8")
+            out += _frame(KEYFRAME, payload)
+            self._since_keyframe = 0
+        else:
+            mask = bytearray((len(values) + 7) // 8)
+            changed = []
+            fmt = "<"
+            for i, (value, previous) in enumerate(zip(values, self._previous, strict=False)):
+                # Slot types are fixed per segment, so only a signed zero can
+                # compare equal to its previous value and still differ
+                if value != previous or (
+                    value == 0 and math.copysign(1.0, value) != math.copysign(1.0, previous)
+                ):
+                    mask[i >> 3] |= 1 << (i & 7)
+                    changed.append(value)
+                    fmt += self._pack_kinds[i]
+
+            payload = bytes(mask) + struct.pack(fmt, *changed)
+
+            changed_others = {
+                i: value
+                for i, (value, previous) in enumerate(zip(others, self._other_previous, strict=False))
+                if _changed(value, previous)
+            }
+            if changed_others:
+                payload += json.dumps(changed_others, separators=(",", ":")).encode("utf-8")
+
+            out += _frame(DELTA, payload)
+
+        self._previous = values
+        self._other_previous = others
+        self._since_keyframe += 1
+        return out
+
+    def serialize_batch(self, records):
+        """Encode a batch of records; usable as a TelemetrySink serializer."""
+        return b"".join(self.encode(record) for record in records)
+
+
+def _frame(tag, payload):
+    return _FRAME_HEADER.pack(tag, len(payload)) + payload
+
+
+def iter_frames(stream):
+    """Yield (tag, payload) pairs from a binary frame stream."""
+    while True:
+        header = stream.read(_FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < _FRAME_HEADER.size:
+            raise ValueError("Truncated frame header")
+
+        tag, length = _FRAME_HEADER.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError("Truncated frame payload")
+
+        yield tag, payload
+
+
+class TraceDecoder:
+    """Rebuilds the original records from a frame stream."""
+
+    def __init__(self):
+        self._segment = None
+        self._values = None
+        self._others = None
+
+    def decode_frame(self, tag, payload):
+        """Apply one frame, returning the reconstructed record (None for segment headers)."""
+        if tag == SEGMENT:
+            header = json.loads(payload)
+            float_format = header["float_format"]
+            kinds = [kind for _, kind in header["slots"]]
+            self._segment = {
+                "template": header["template"],
+                "slot_paths": [tuple(path) for path, _ in header["slots"]],
+                "kinds": kinds,
+                "pack_kinds": [float_format if k == "d" else "q" for k in kinds],
+                "other_paths": [tuple(path) for path in header["others"]],
+            }
+            self._values = None
+            self._others = None
+            return None
+
+        if self._segment is None:
+            raise ValueError("Frame before first segment header")
+
+        pack_kinds = self._segment["pack_kinds"]
+
+        if tag == KEYFRAME:
+            slot_fmt = struct.Struct("<" + "".join(pack_kinds))
+            self._values = list(slot_fmt.unpack_from(payload))
+            self._others = json.loads(payload[slot_fmt.size :])
+        elif tag == DELTA:
+            if self._values is None:
+                raise ValueError("Delta frame without preceding keyframe")
+
+            mask_size = (len(pack_kinds) + 7) // 8
+            mask = payload[:mask_size]
+            changed = [i for i in range(len(pack_kinds)) if mask[i >> 3] & (1 << (i & 7))]
+            fmt = struct.Struct("<" + "".join(pack_kinds[i] for i in changed))
+
+            for i, value in zip(changed, fmt.unpack_from(payload, mask_size), strict=False):
+                self._values[i] = value
+
+            tail = payload[mask_size + fmt.size :]
+            if tail:
+                for index, value in json.loads(tail).items():
+                    self._others[int(index)] = value
+        else:
+            raise ValueError(f"Unknown frame tag {tag!r}")
+
+        return self._materialize()
+
+    def _materialize(self):
+        segment = self._segment
+        record = copy.deepcopy(segment["template"])
+
+        for path, kind, value in zip(segment["slot_paths"], segment["kinds"], self._values, strict=False):
+            _set_path(record, path, _micros_to_timestamp(value) if kind == "T" else value)
+
+        for path, value in zip(segment["other_paths"], self._others, strict=False):
+            _set_path(record, path, value)
+
+        return record
+
+    def decode_stream(self, stream):
+        """Yield every record contained in a binary stream."""
+        for tag, payload in iter_frames(stream):
+            record = self.decode_frame(tag, payload)
+            if record is not None:
+                yield record
+
+
+def encode_records(records, keyframe_interval=100, float_format="d"):
+    """Encode an iterable of records into bytes."""
+    encoder = TraceEncoder(keyframe_interval, float_format)
+    return encoder.serialize_batch(records)
+
+
+def decode_records(data):
+    """Decode bytes produced by encode_records back into a list of records."""
+    return list(TraceDecoder().decode_stream(io.BytesIO(data)))
+
+
+def encode_trace_file(input_path, output_path, keyframe_interval=100, float_format="d"):
+    """Convert a JSONL trace into the delta-encoded binary format."""
+    encoder = TraceEncoder(keyframe_interval, float_format)
+    n_records = 0
+
+    with open(input_path, encoding="utf-8") as src, open(output_path, "wb") as dst:
+        for line in src:
+            if line.strip():
+                dst.write(encoder.encode(json.loads(line)))
+                n_records += 1
+
+    return n_records
+
+
+def decode_trace_file(input_path, output_path=None):
+    """Decode a binary trace, writing JSONL if output_path is given, else returning records."""
+    with open(input_path, "rb") as src:
+        records = TraceDecoder().decode_stream(src)
+
+        if output_path is None:
+            return list(records)
+
+        with open(output_path, "w", encoding="utf-8") as dst:
+            for record in records:
+                dst.write(json.dumps(record) + "\n")
+
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    encode_parser = subparsers.add_parser("encode", help="JSONL trace -> delta-encoded binary")
+    encode_parser.add_argument("input")
+    encode_parser.add_argument("output")
+    encode_parser.add_argument("--keyframe-interval", type=int, default=100)
+    encode_parser.add_argument("--float32", action="store_true", help="Store float slots as float32 (lossy)")
+
+    decode_parser = subparsers.add_parser("decode", help="Delta-encoded binary -> JSONL trace")
+    decode_parser.add_argument("input")
+    decode_parser.add_argument("output")
+
+    args = parser.parse_args()
+
+    if args.command == "encode":
+        n_records = encode_trace_file(
+            args.input,
+            args.output,
+            keyframe_interval=args.keyframe_interval,
+            float_format="f" if args.float32 else "d",
+        )
+        original = os.path.getsize(args.input)
+        encoded = os.path.getsize(args.output)
+        print(f"✅ Encoded {n_records} records: {original:,} → {encoded:,} bytes ({original / max(encoded, 1):.1f}x)")
+    else:
+        decode_trace_file(args.input, args.output)
+        print(f"✅ Decoded trace saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Mergeable Emotion Reasoning Tracker Aggregation
+
+Summarizes the trials of emotion_reasoning_state_tracker_*.json runs with
+partial statistics that can be computed on any split of the trials (per
+process, per file) and merged afterwards. Every numeric leaf of a trial is
+tracked, including the nested homeostasis, reasoning_metrics and
+metacognition blocks ("homeostasis.phi_max", "metacognition.coherence", ...).
+
+Per field the partials hold count, mean, M2, min/max, first/last by
+trial_index, and null and non-finite counts; partials merge with the Chan et
+al. pairwise update. Trials are always processed in fixed chunks of
+chunk_size that are merged in input order, whether the chunks run serially
+or in worker processes, so a parallel run returns bit-for-bit the same
+summary as a serial one with the same chunk_size.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Top-level fields the tracker itself summarizes with first/last/mean/drift
+TRACKED_METRICS = ["emotional_stability", "coherence", "mmlu_accuracy"]
+
+DEFAULT_CHUNK_SIZE = 50000
+
+
+class FieldStats:
+    """Mergeable partial statistics for one trial field.
+
+    first/last are (order key, value) pairs. The order key is
+    (source, trial_index, position): source numbers the input file, and
+    position, the trial's place within that source, stands in for a missing
+    trial_index and breaks ties.
+    """
+
+    __slots__ = ("count", "nulls", "nonfinite", "mean", "m2", "min", "max", "first", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.nonfinite = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.first = None
+        self.last = None
+
+    @classmethod
+    def from_values(cls, values, keys, nulls=0, nonfinite=0):
+        """Partials for a batch of finite values with their order keys."""
+        stats = cls()
+        stats.nulls = nulls
+        stats.nonfinite = nonfinite
+        if not values:
+            return stats
+
+        stats.count = len(values)
+        stats.mean = math.fsum(values) / stats.count
+        stats.m2 = math.fsum((value - stats.mean) ** 2 for value in values)
+        stats.min = min(values)
+        stats.max = max(values)
+
+        first = min(range(len(keys)), key=keys.__getitem__)
+        last = max(range(len(keys)), key=keys.__getitem__)
+        stats.first = (keys[first], values[first])
+        stats.last = (keys[last], values[last])
+        return stats
+
+    def merge(self, other):
+        """Fold in the partials for another set of trials."""
+        self.nulls += other.nulls
+        self.nonfinite += other.nonfinite
+        if not other.count:
+            return self
+        if not self.count:
+            for name in ("count", "mean", "m2", "min", "max", "first", "last"):
+                setattr(self, name, getattr(other, name))
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.first = min(self.first, other.first, key=lambda pair: pair[0])
+        self.last = max(self.last, other.last, key=lambda pair: pair[0])
+        return self
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return None
+        return self.m2 / (self.count - 1)
+
+    def summary(self):
+        first = self.first[1] if self.first else None
+        last = self.last[1] if self.last else None
+        variance = self.variance
+        return {
+            "first": first,
+            "last": last,
+            "mean": self.mean if self.count else None,
+            "drift": last - first if self.count else None,
+            "std": variance ** 0.5 if variance is not None else None,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count,
+            "nulls": self.nulls,
+            "nonfinite": self.nonfinite,
+        }
+
+
+class TrialAggregate:
+    """Partial statistics for a set of tracker trials, keyed by field path."""
+
+    def __init__(self):
+        self.n_trials = 0
+        self.fields = {}
+
+    @staticmethod
+    def _add_block(block, prefix, row, columns):
+        for key, value in block.items():
+            kind = type(value)
+            if kind is dict:
+                TrialAggregate._add_block(value, f"{prefix}{key}.", row, columns)
+            elif kind is float or kind is int or kind is bool or value is None:
+                # Booleans are ints, so flags summarize as rates
+                path = prefix + key
+                column = columns.get(path)
+                if column is None:
+                    column = columns[path] = ([], [])
+                column[0].append(value)
+                column[1].append(row)
+
+    def add_trials(self, trials, offset=0, source=0):
+        """Add a batch of trials as one partial.
+
+        offset is the position of the first trial within its source, so
+        chunks of one input order index-less trials consistently.
+        """
+        columns = {}
+        order_keys = []
+        for row, trial in enumerate(trials):
+            position = offset + row
+            trial_index = trial.get("trial_index")
+            order_keys.append((source, position if trial_index is None else trial_index, position))
+            for key, value in trial.items():
+                if key == "trial_index":
+                    continue
+                kind = type(value)
+                if kind is dict:
+                    self._add_block(value, key + ".", row, columns)
+                elif kind is float or kind is int or kind is bool or value is None:
+                    column = columns.get(key)
+                    if column is None:
+                        column = columns[key] = ([], [])
+                    column[0].append(value)
+                    column[1].append(row)
+
+        partial = TrialAggregate()
+        partial.n_trials = len(trials)
+        for path, (values, rows) in columns.items():
+            finite_values, finite_keys = [], []
+            for value, row in zip(values, rows, strict=False):
+                if value is not None and math.isfinite(value):
+                    finite_values.append(value)
+                    finite_keys.append(order_keys[row])
+            nulls = values.count(None)
+            nonfinite = len(values) - nulls - len(finite_values)
+            partial.fields[path] = FieldStats.from_values(finite_values, finite_keys, nulls, nonfinite)
+        return self.merge(partial)
+
+    def add_trial(self, trial, position=None, source=0):
+        """Add one trial; position defaults to the number of trials seen so far."""
+        return self.add_trials([trial], self.n_trials if position is None else position, source)
+
+    def merge(self, other):
+        """Fold in an aggregate of other trials (merge in input order for determinism)."""
+        self.n_trials += other.n_trials
+        for path, stats in other.fields.items():
+            if path in self.fields:
+                self.fields[path].merge(stats)
+            else:
+                self.fields[path] = stats
+        return self
+
+    def summary(self):
+        """Tracker-style summary: n_trials, the tracked metrics, and every field."""
+        fields = {}
+        for path in sorted(self.fields):
+            stats = self.fields[path].summary()
+            # Fields absent from some trials count as nulls there
+            stats["nulls"] = self.n_trials - stats["count"] - stats["nonfinite"]
+            fields[path] = stats
+
+        summary = {"n_trials": self.n_trials}
+        for metric in TRACKED_METRICS:
+            stats = fields.get(metric)
+            summary[metric] = {
+                key: stats[key] if stats else None for key in ("first", "last", "mean", "drift")
+            }
+        summary["fields"] = fields
+        return summary
+
+
+def load_trials(path):
+    """Trials from a tracker JSON file or a JSONL file with one trial per line."""
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f).get("trials", [])
+
+
+def _aggregate_chunk(trials, offset=0, source=0):
+    return TrialAggregate().add_trials(trials, offset, source)
+
+
+def aggregate_trials(trials, chunk_size=DEFAULT_CHUNK_SIZE, source=0):
+    """Serial aggregation over the same chunks aggregate_trials_parallel uses."""
+    result = TrialAggregate()
+    for offset in range(0, len(trials), chunk_size):
+        result.merge(_aggregate_chunk(trials[offset : offset + chunk_size], offset, source))
+    return result
+
+
+def aggregate_file(path, chunk_size=DEFAULT_CHUNK_SIZE, source=0):
+    return aggregate_trials(load_trials(path), chunk_size, source)
+
+
+def aggregate_trials_parallel(trials, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Aggregate contiguous chunks of trials in worker processes and merge in order."""
+    offsets = list(range(0, len(trials), chunk_size))
+    chunks = [trials[offset : offset + chunk_size] for offset in offsets]
+    result = TrialAggregate()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(_aggregate_chunk, chunks, offsets):
+            result.merge(partial)
+    return result
+
+
+def aggregate_files(paths, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Aggregate each file in its own process and merge in path order."""
+    sources = range(len(paths))
+    result = TrialAggregate()
+    if workers == 1:
+        for source, path in zip(sources, paths, strict=False):
+            result.merge(aggregate_file(path, chunk_size, source))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(aggregate_file, paths, [chunk_size] * len(paths), sources):
+            result.merge(partial)
+    return result
+
+
+def generate_synthetic_trials(n_trials, seed=42):
+    """Trials shaped like emotion_reasoning_state_tracker output."""
+    rng = random.Random(seed)
+    trials = []
+    for i in range(1, n_trials + 1):
+        trials.append(
+            {
+                "trial_index": i,
+                "perturbation": "mmlu_reasoning_task",
+                "structured_reasoning": True,
+                "chain_of_thought_depth": rng.randint(1, 4),
+                "symbolic_inference": rng.random() < 0.9,
+                "mathematical_reasoning": True,
+                "emotional_stability": round(rng.uniform(0.8, 0.95), 2),
+                "coherence": rng.random() if rng.random() < 0.3 else None,
+                "mmlu_accuracy": 0.7742 + rng.gauss(0, 1e-5),
+                "homeostasis": {
+                    "phi_max": rng.uniform(2000.0, 2600.0),
+                    "phi_final": rng.uniform(20.0, 30.0),
+                    "t_rec": None,
+                    "delta_ccs": rng.gauss(-0.186, 0.001),
+                    "epci": rng.uniform(-1.0, 1.0),
+                    "n_interventions": rng.randint(0, 3),
+                },
+                "reasoning_metrics": {
+                    "pathway_activation_diversity": 0.98,
+                    "reasoning_pathways_active": 3,
+                    "chain_of_thought_utilization": 2,
+                },
+                "metacognition": {
+                    "coherence": 0.945,
+                    "cognitive_load_penalty": 0.025,
+                    "metacognitive_confidence": rng.uniform(0.4, 0.7),
+                },
+            }
+        )
+    return trials
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="*", help="Tracker JSON or trial JSONL files")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--synthetic", type=int, help="Aggregate N synthetic trials instead of files")
+    parser.add_argument("--verify", action="store_true", help="Check the parallel summary against a serial pass")
+    parser.add_argument("--output", help="Write the summary JSON to this path")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        trials = generate_synthetic_trials(args.synthetic)
+        aggregate = aggregate_trials_parallel(trials, args.workers, args.chunk_size)
+        serial = (lambda trials: aggregate_trials(trials, args.chunk_size)) if args.verify else None
+        source = trials
+    else:
+        if not args.inputs:
+            parser.error("pass tracker files or --synthetic N")
+        paths = sorted(args.inputs)
+        aggregate = aggregate_files(paths, args.workers, args.chunk_size)
+        serial = (lambda paths: aggregate_files(paths, 1, args.chunk_size)) if args.verify else None
+        source = paths
+
+    summary = aggregate.summary()
+    print(f"✅ Aggregated {summary['n_trials']} trials over {len(summary['fields'])} fields")
+    for metric in TRACKED_METRICS:
+        stats = summary[metric]
+        print(f"   {metric}: mean={stats['mean']} drift={stats['drift']}")
+
+    if serial:
+        matches = serial(source).summary() == summary
+        print(f"   Serial check: {'identical' if matches else 'MISMATCH'}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"   Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()